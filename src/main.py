@@ -4,7 +4,7 @@ import sys
 import shlex
 from pathlib import Path
 
-from util.output import Printer, Colors
+from util.output import Printer, Colors, enable_debug
 from util.errors import RunError, ConfigError
 from util.update import update
 from util.args import args as args_parser
@@ -13,13 +13,21 @@ from util.version import version
 
 from runner import CompilerRunner
 
-def main():
+def main(argv=None):
+    """
+    Entry point of the CLI.
+
+    Args:
+        argv (list[str] | None): Command line arguments, defaults to sys.argv[1:].
+
+    Returns:
+        int: Exit code.
+    """
     __version__ = version()
-    args = args_parser(__version__)
+    args = args_parser(__version__, argv)
     
     if args.debug:
-        import logging
-        logging.getLogger("run_kuranne").setLevel(logging.DEBUG)
+        enable_debug()
         Printer.debug("Debug logging enabled")
 
     # Handle update function
@@ -14,6 +14,11 @@ class BaseRunner:
     Base class for runners, handling common functionality like command execution,
     platform detection, and cleanup.
     """
+    __slots__ = (
+        "is_posix", "flags", "dry_run", "preset", "config", "output_files",
+        "exclude_exts", "exclude_files", "extra_flags", "run_args",
+    )
+
     def __init__(self, op_flags: Dict[str, Any], extra_flags: str = "", run_args: str = ""):
         """
         Initialize BaseRunner.
@@ -32,7 +37,7 @@ class BaseRunner:
         self.preset = self.flags.get("preset", None)
         
         # Config & Others
-        self.config = Config()
+        self.config = Config(use_cache=not self.flags.get("no_cache", False))
         excludes = self.config.get_exclude()
         self.output_files: List[Path] = []
         self.exclude_exts: List[str] = ['.toml', '.lock'] + excludes.get("extensions", [])
@@ -145,6 +150,12 @@ class BaseRunner:
             except (ConfigError, ExecutionError, FileNotFoundError, OSError) as e:
                 Printer.error(f"Multi-file compilation failed: {e}")
         else:
+            try:
+                # Compile independent Java files together, each one still runs on its own
+                self._precompile_java_batch(file_paths)
+            except (ConfigError, ExecutionError, FileNotFoundError, OSError) as e:
+                Printer.error(f"Batch Java compilation failed: {e}")
+
             for fp in file_paths:
                 try:
                     self._handle_single_file(fp)
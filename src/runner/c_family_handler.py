@@ -7,14 +7,15 @@ class CFamilyHandler:
     """
     Mixin class handling C/C++ specific operations.
     """
-    def __init__(self):
-        self.c_family_ext = {'.c', '.cpp', '.cc'}
-        self.c_family_header_ext = {'.h', '.hpp'}
+    # State (c_family_ext, c_family_header_ext) is declared and initialised by CompilerRunner
+    __slots__ = ()
 
     def _compile_object_file(self, compiler: str, source: Path, extra_cmd: List[str], cache) -> Optional[Path]:
         """
         Compile a single source file to object file.
         Returns path to object file if successful, None otherwise.
+        Runs on worker threads, so the cache is only read here (for the object path);
+        the caller checks and updates it.
         """
         if cache:
             # Use cache directory for object files
@@ -27,11 +28,6 @@ class CFamilyHandler:
             # Let's keep it simple: source.o
             obj_file = source.with_suffix(".o") if self.is_posix else source.with_suffix(".obj")
 
-        # Check cache
-        if cache and not cache.is_changed(source) and obj_file.exists():
-            # Cache hit
-            return obj_file
-
         from util.output import Printer
         Printer.action("COMPILE", f"{source.name} -> object")
         cmd = [compiler, "-c", str(source), "-o", str(obj_file)] + extra_cmd
@@ -41,8 +37,6 @@ class CFamilyHandler:
             # We DONT add to output_files because:
             # 1. If cached, we want to persist them in cache
             # 2. If no-cache, we return the path and add to output_files in the caller
-            if cache:
-                cache.update_cache(source)
             return obj_file
         except Exception:
             return None
@@ -99,11 +93,25 @@ class CFamilyHandler:
         max_workers = min(32, (os.cpu_count() or 1) + 4)
         from util.output import Printer
         Printer.info(f"Compiling {len(sources)} files using {max_workers} threads...")
+
+        # Check all sources against the cache up front, hashing them in parallel,
+        # so only the ones that need a rebuild reach the compile pool
+        to_compile = sources
+        if self.cache:
+            changed = self.cache.batch_is_changed(sources)
+            to_compile = []
+            for src in sources:
+                # Resolved for every source here, so the workers only read the memoized path
+                obj_file = self.cache.get_object_path(src)
+                if not changed[src] and os.path.exists(obj_file):
+                    object_files.append(obj_file)
+                    continue
+                to_compile.append(src)
         
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_to_source = {
                 executor.submit(self._compile_object_file, compiler, src, base_cmd, self.cache): src 
-                for src in sources
+                for src in to_compile
             }
             
             for future in concurrent.futures.as_completed(future_to_source):
@@ -112,8 +120,12 @@ class CFamilyHandler:
                     obj_path = future.result()
                     if obj_path:
                         object_files.append(obj_path)
-                        # If no cache, we need to ensure these object files are cleaned up
-                        if self.cache is None:
+                        # CacheManager is not thread safe, so entries are updated here
+                        # on the submitting thread rather than in the workers
+                        if self.cache:
+                            self.cache.update_cache(src)
+                        else:
+                            # If no cache, we need to ensure these object files are cleaned up
                             self.output_files.append(obj_path)
                     else:
                         failed = True
@@ -121,6 +133,10 @@ class CFamilyHandler:
                     Printer.error(f"Failed to compile {src}: {e}")
                     failed = True
 
+        # Write all cache updates of this build at once
+        if self.cache:
+            self.cache.flush()
+
         if failed:
             from util.errors import ExecutionError
             raise ExecutionError("Build failed during compilation phase.")
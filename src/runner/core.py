@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set
 import re
 import concurrent.futures
 import os
@@ -20,6 +20,12 @@ class CompilerRunner(BaseRunner, RustHandler, PythonHandler, JavaHandler,
     Main runner class that handles compilation and execution logic for various languages.
     Inherits from BaseRunner and all language-specific handlers.
     """
+    # Mixins declare empty slots, so all handler state lives here
+    __slots__ = (
+        "c_family_ext", "c_family_header_ext", "java_ext", "java_precompiled",
+        "cache", "cargo_toml_data",
+    )
+
     def __init__(self, op_flags: Dict[str, Any], extra_flags: str = "", run_args: str = ""):
         """
         Initialize the CompilerRunner.
@@ -34,6 +40,10 @@ class CompilerRunner(BaseRunner, RustHandler, PythonHandler, JavaHandler,
         self.c_family_ext = {'.c', '.cpp', '.cc'}
         self.c_family_header_ext = {'.h', '.hpp'}
         self.java_ext = {'.java'}
+        # Java files already compiled by _precompile_java_batch
+        self.java_precompiled: Set[Path] = set()
+        # Initialize RustHandler attributes
+        self.cargo_toml_data: Dict[str, Any] = {}
         
         if self.flags.get("no_cache", False):
             self.cache = None
@@ -59,12 +69,12 @@ class CompilerRunner(BaseRunner, RustHandler, PythonHandler, JavaHandler,
         # 0 means just the current directory (no recursion into subdirs)
         # 1 means current + 1 level deep
         
-        start_level = len(path.absolute().parts)
-        
         for p in path.rglob("*"):
             if max_depth is not None:
-                current_level = len(p.parent.absolute().parts)
-                if current_level - start_level > max_depth:
+                # rglob yields paths under `path`, so depth is the number of
+                # separators in the relative part (pure string work, no getcwd)
+                depth = str(p.relative_to(path)).count(os.sep)
+                if depth > max_depth:
                     continue
                 
             if p.is_file() and p.suffix in ext:
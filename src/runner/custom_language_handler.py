@@ -5,6 +5,8 @@ class CustomLanguageHandler:
     """
     Mixin class handling custom language configurations.
     """
+    __slots__ = ()
+
     def _handle_custom_language(self, fp: Path, lang_config: dict, out_name: Path):
         """
         Handle custom language execution based on configuration.
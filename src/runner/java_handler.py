@@ -1,11 +1,13 @@
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Dict
 import re
 
 class JavaHandler:
     """
     Mixin class handling Java-specific operations.
     """
+    __slots__ = ()
+
     def _extract_java_main_class(self, java_file: Path) -> Optional[str]:
         """
         Extract the main class name from a Java file.
@@ -44,6 +46,82 @@ class JavaHandler:
             raise ExecutionError(f"Error while reading Java file: {e}")
         return None
 
+    def _precompile_java_batch(self, paths: List[Path]):
+        """
+        Compile independent Java files with a single javac call.
+        Each file is still run on its own afterwards by _handle_java_single_file,
+        this only saves the JVM start-up of javac for every file.
+        Falls back to per-file compilation if the batch fails.
+
+        Args:
+            paths (List[Path]): All files given to compile_and_run.
+        """
+        if ".java" in self.exclude_exts or self.config.get_language_by_extension(".java"):
+            return
+
+        sources = [
+            p for p in paths
+            if p.suffix.lower() == ".java" and p.name not in self.exclude_files and p.is_file()
+        ]
+        if len(sources) < 2:
+            return
+
+        from util.output import Printer
+        from util.errors import RunError
+        compiler = self.config.get_runner("java", "javac")
+        preset_flags = self.config.get_preset_flags(self.preset, "java")
+
+        parent_dirs = set(src.parent for src in sources)
+        before_state = self._snapshot_class_files(parent_dirs)
+
+        cmd = [compiler] + self.extra_flags + preset_flags + [str(s) for s in sources]
+        Printer.info(f"Compiling {len(sources)} Java files in one javac call...")
+        try:
+            self.run_command(cmd, compiling=True)
+        except RunError as e:
+            Printer.warning(f"Batch Java compilation failed ({e}), compiling files one by one")
+            return
+
+        self._track_class_files(parent_dirs, before_state)
+        self.java_precompiled.update(sources)
+
+    def _snapshot_class_files(self, dirs) -> Dict[Path, float]:
+        """
+        Record mtimes of existing .class files in the given directories.
+
+        Args:
+            dirs: Directories to scan.
+
+        Returns:
+            Dict[Path, float]: Mapping of class file to its mtime.
+        """
+        before_state = {}
+        for d in dirs:
+            for p in d.glob("*.class"):
+                try:
+                    before_state[p] = p.stat().st_mtime
+                except FileNotFoundError:
+                    pass
+        return before_state
+
+    def _track_class_files(self, dirs, before_state: Dict[Path, float]):
+        """
+        Add new or modified .class files to output_files for cleanup.
+
+        Args:
+            dirs: Directories to scan.
+            before_state (Dict[Path, float]): Snapshot taken before compiling.
+        """
+        for d in dirs:
+            for p in d.glob("*.class"):
+                try:
+                    mtime = p.stat().st_mtime
+                    if p not in before_state or mtime > before_state[p]:
+                        if p not in self.output_files:
+                            self.output_files.append(p)
+                except FileNotFoundError:
+                    pass
+
     def _handle_java_single_file(self, fp: Path):
         """
         Handle single Java file compilation and execution.
@@ -51,17 +129,21 @@ class JavaHandler:
         Args:
             fp (Path): Path to the Java source file.
         """
+        if fp in self.java_precompiled:
+            # Already compiled by _precompile_java_batch
+            main_class = self._extract_java_main_class(fp)
+            if not main_class:
+                from util.errors import ExecutionError
+                raise ExecutionError(f"Could not find main class in {fp}")
+            self.run_command(["java", main_class] + self.run_args)
+            return
+
         compiler = self.config.get_runner("java", "javac")
         preset_flags = self.config.get_preset_flags(self.preset, "java")
         
         # Record state of .class files before compilation
         parent_dir = fp.parent
-        before_state = {}
-        for p in parent_dir.glob("*.class"):
-            try:
-                before_state[p] = p.stat().st_mtime
-            except FileNotFoundError:
-                pass
+        before_state = self._snapshot_class_files([parent_dir])
 
         # Compile the Java file
         cmd = [compiler] + self.extra_flags + preset_flags + [str(fp)]
@@ -73,13 +155,7 @@ class JavaHandler:
         main_class = self._extract_java_main_class(fp)
         if main_class:
             # Track newly created or modified .class files for cleanup
-            for p in parent_dir.glob("*.class"):
-                try:
-                    mtime = p.stat().st_mtime
-                    if p not in before_state or mtime > before_state[p]:
-                        self.output_files.append(p)
-                except FileNotFoundError:
-                    pass
+            self._track_class_files([parent_dir], before_state)
 
             self.run_command(["java", main_class] + self.run_args)
         else:
@@ -98,13 +174,7 @@ class JavaHandler:
         
         # Record class files state across all involved directories
         parent_dirs = set(src.parent for src in sources)
-        before_state = {}
-        for d in parent_dirs:
-            for p in d.glob("*.class"):
-                try:
-                    before_state[p] = p.stat().st_mtime
-                except FileNotFoundError:
-                    pass
+        before_state = self._snapshot_class_files(parent_dirs)
 
         # Compile all Java files
         cmd = [compiler] + self.extra_flags + preset_flags + [str(s) for s in sources]
@@ -117,14 +187,7 @@ class JavaHandler:
         if not main_class:
             raise ExecutionError(f"Error while executing {sources[0]}")
         # Track new or modified .class files for cleanup
-        for d in parent_dirs:
-            for p in d.glob("*.class"):
-                try:
-                    mtime = p.stat().st_mtime
-                    if p not in before_state or mtime > before_state[p]:
-                        self.output_files.append(p)
-                except FileNotFoundError:
-                    pass
+        self._track_class_files(parent_dirs, before_state)
         
         # Run the main class
         cmd = ["java", main_class] + self.run_args
@@ -5,6 +5,7 @@ class PythonHandler:
     """
     Mixin class handling Python-specific operations.
     """
+    __slots__ = ()
 
     def _get_python_executable(self) -> str:
         """
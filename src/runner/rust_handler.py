@@ -1,14 +1,14 @@
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional
 from util.output import Printer
 
 class RustHandler:
-    def __init__(self):
-        self.cargo_toml_data: Dict[str, Any] = {}
-
     """
     Mixin class handling Cargo/Rust specific operations.
     """
+    # State (cargo_toml_data) is declared and initialised by CompilerRunner
+    __slots__ = ()
+
     def _find_cargo_toml(self, start_path: Path) -> Optional[Path]:
         """
         Walk up from start_path to find Cargo.toml.
@@ -1,11 +1,13 @@
 from pathlib import Path
 from util.errors import ConfigError
-import subprocess as spc
+from shutil import which
 
 class ScriptHandler:
     """
     Mixin class handling interpreted script languages.
     """
+    __slots__ = ()
+
     def _detect_language_from_shebang(self, fp: Path) -> str:
         """
         Detect language from shebang line.
@@ -35,7 +37,6 @@ class ScriptHandler:
         Args:
             fp (Path): Path to the Lua source file.
         """
-        check_cmd = "where" if not self.is_posix else "command -v"
-        is_lua = spc.run(f"{check_cmd} lua", shell=True, capture_output=True).returncode == 0
-        prog = "lua" if is_lua else "luajit"
+        # shutil.which looks up PATH (and PATHEXT on Windows) without spawning a shell
+        prog = "lua" if which("lua") else "luajit"
         self.run_command([prog, str(fp)] + self.run_args)
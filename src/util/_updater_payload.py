@@ -0,0 +1,293 @@
+"""
+Standalone updater, run by `run --update` after the CLI has exited.
+
+update() copies this file next to the extracted release and starts it with the
+paths on the command line. Only the standard library may be imported here:
+the module runs from the temp dir, outside the installed package.
+"""
+import os
+import sys
+import shutil
+import time
+import subprocess
+import re
+import select
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+# Opened once by main() from --log-file, None if it could not be opened
+_LOG_FH = None
+
+def log(msg, flush=False):
+    # Buffered writes; flush only where someone may be watching the log
+    if _LOG_FH is None:
+        return
+    _LOG_FH.write(str(msg) + "\n")
+    if flush:
+        _LOG_FH.flush()
+
+def force_remove(path):
+    if not path.exists(): return
+    try:
+        if path.is_dir() and not path.is_symlink():
+            # Fix read-only files before removing
+            def unlink_readonly(func, path, excinfo):
+                os.chmod(path, 0o777)
+                func(path)
+            shutil.rmtree(path, onerror=unlink_readonly)
+        else:
+            os.chmod(path, 0o777) if os.name != 'nt' else None
+            os.remove(path)
+    except Exception as e:
+        log(f"Error removing {path}: {e}")
+        time.sleep(1)
+
+def wait_for_exit(pid):
+    # Block on the process itself where the OS allows it, poll only as a last resort
+    if hasattr(os, "pidfd_open"):
+        try:
+            fd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            return
+        except OSError:
+            pass  # e.g. kernel without pidfd support
+        else:
+            try:
+                select.select([fd], [], [])
+            finally:
+                os.close(fd)
+            return
+    elif os.name == "nt":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x00100000, False, pid)  # SYNCHRONIZE
+        if not handle:
+            return
+        try:
+            kernel32.WaitForSingleObject(handle, 0xFFFFFFFF)  # INFINITE
+        finally:
+            kernel32.CloseHandle(handle)
+        return
+    elif hasattr(select, "kqueue"):
+        kq = select.kqueue()
+        try:
+            event = select.kevent(
+                pid, filter=select.KQ_FILTER_PROC,
+                flags=select.KQ_EV_ADD | select.KQ_EV_ONESHOT, fflags=select.KQ_NOTE_EXIT,
+            )
+            kq.control([event], 1, None)
+        except ProcessLookupError:
+            pass
+        finally:
+            kq.close()
+        return
+
+    while True:
+        try:
+            os.kill(pid, 0)
+            time.sleep(0.5)
+        except OSError:
+            break
+
+def move_into_place(item, dest, trash):
+    # One rename within a filesystem, no bytes read or written. An existing
+    # directory is renamed aside first and queued in trash for deletion.
+    old = None
+    if dest.is_dir() and not dest.is_symlink():
+        old = dest.with_name(dest.name + ".old")
+        force_remove(old)
+        os.replace(dest, old)
+    try:
+        os.replace(item, dest)
+    except OSError:
+        if old is not None:
+            os.replace(old, dest)
+        raise
+    if old is not None:
+        trash.append(old)
+
+def install_file(src, dest, use_link):
+    # A hardlink only writes metadata, fall back to a real copy across filesystems
+    if use_link:
+        try:
+            os.link(src, dest)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dest)
+
+def unlink_all(paths):
+    for path in paths:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+def remove_tree(root, max_batch=10_000):
+    # Collect every file first, unlink them in batches on a pool, then
+    # remove the now empty directories deepest first
+    files, dirs = [], []
+    for current, subdirs, names in os.walk(root):
+        dirs.append(current)
+        files.extend(os.path.join(current, name) for name in names)
+        # Symlinked directories are not walked, the link itself is unlinked
+        files.extend(os.path.join(current, d) for d in subdirs if os.path.islink(os.path.join(current, d)))
+
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    batch_size = max(1, min(max_batch, -(-len(files) // workers)))
+    it = iter(files)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for n, batch in enumerate(iter(lambda: list(islice(it, batch_size)), []), 1):
+            executor.submit(unlink_all, batch)
+            log(f"Cleanup batch {n}: {len(batch)} files")
+
+    for d in reversed(dirs):
+        try:
+            os.rmdir(d)
+        except OSError:
+            pass
+    # Anything left behind (e.g. read-only entries) goes the slow way
+    shutil.rmtree(root, ignore_errors=True)
+
+def refresh_pyproject_toml(path, content):
+    try:
+        path.write_text(content, encoding="utf-8")
+        log(f"Refreshed pyproject.toml content.")
+    except Exception as e:
+        log(f"Failed to refresh pyproject.toml: {e}")
+
+def parse_args(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Install a downloaded run release")
+    parser.add_argument("--log-file", required=True)
+    parser.add_argument("--parent-pid", type=int, required=True)
+    parser.add_argument("--src-dir", type=Path, required=True)
+    parser.add_argument("--install-dir", type=Path, required=True)
+    parser.add_argument("--temp-root", type=Path, required=True)
+    parser.add_argument("--pyproject-file", type=Path, required=True,
+                        help="Remote pyproject.toml content to write into the install dir")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    global _LOG_FH
+    args = parse_args(argv)
+    try:
+        _LOG_FH = open(args.log_file, "a", encoding="utf-8", buffering=8192)
+    except OSError:
+        _LOG_FH = None
+
+    log("Starting update process...")
+    
+    # Wait for parent process to exit
+    pid = args.parent_pid
+    log(f"Waiting for parent process {pid} to exit...", flush=True)
+    try:
+        wait_for_exit(pid)
+    except Exception as e:
+        log(f"Error waiting for process: {e}")
+    
+    # Give it an extra second to release file locks (important on Windows)
+    time.sleep(1)
+    
+    src_dir = args.src_dir
+    install_dir = args.install_dir
+    temp_root = args.temp_root
+    
+    try:
+        # Renames and hardlinks only work within one filesystem, decide once
+        try:
+            use_link = os.stat(src_dir).st_dev == os.stat(install_dir).st_dev
+        except OSError:
+            use_link = False
+        log(f"{'Moving' if use_link else 'Copying'} files from {src_dir} to {install_dir}")
+        
+        # Replace each top-level item: on one filesystem by renaming it into place,
+        # otherwise remove the old one and create the new directory tree up front,
+        # collecting the files to install
+        jobs = []
+        trash = []
+        for item in src_dir.iterdir():
+            dest = install_dir / item.name
+
+            if use_link:
+                try:
+                    move_into_place(item, dest, trash)
+                    continue
+                except OSError as e:
+                    log(f"Could not move {item} ({e}), copying instead")
+            
+            if dest.exists():
+                force_remove(dest)
+                
+            if item.is_dir():
+                for root, _dirs, files in os.walk(item, followlinks=True):
+                    target_root = dest / os.path.relpath(root, item)
+                    os.makedirs(target_root, exist_ok=True)
+                    jobs.extend((os.path.join(root, name), target_root / name) for name in files)
+            else:
+                jobs.append((item, dest))
+
+        # Replaced directories are deleted off the install path
+        cleaners = [threading.Thread(target=shutil.rmtree, args=(old, True)) for old in trash]
+        for cleaner in cleaners:
+            cleaner.start()
+
+        # Files no longer depend on each other, overlap their syscalls on a pool
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            futures = [executor.submit(install_file, src, dest, use_link) for src, dest in jobs]
+
+        errors = []
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                errors.append(e)
+        if errors:
+            for e in errors:
+                log(f"Failed to install file: {e}")
+            raise errors[0]
+        
+        for cleaner in cleaners:
+            cleaner.join()
+        log("Files copied successfully.")
+
+        # Explicitly refresh full pyproject.toml (safeguard)
+        refresh_pyproject_toml(install_dir / "pyproject.toml", args.pyproject_file.read_text(encoding="utf-8"))
+        
+        # Run setup
+        setup_script = install_dir / ("setup.ps1" if os.name == "nt" else "setup.sh")
+        if setup_script.exists():
+            log(f"Running setup script: {setup_script}", flush=True)
+            
+            if os.name != "nt":
+                os.chmod(setup_script, 0o755)
+                cmd = ["/bin/bash", str(setup_script)]
+            else:
+                cmd = ["powershell", "-ExecutionPolicy", "Bypass", "-File", str(setup_script)]
+            
+            # Run setup but don't fail the whole update if setup script has minor errors
+            try:    
+                subprocess.run(cmd, check=True, cwd=install_dir)
+                log("Setup completed successfully.")
+            except subprocess.CalledProcessError as e:
+                log(f"Setup script returned error: {e} (Update files likely preserved)")
+        
+    except Exception as e:
+        log(f"CRITICAL UPDATE FAILED: {e}", flush=True)
+        # Optional: Try to rollback here if you had a backup
+        sys.exit(1)
+    finally:
+        # Cleanup temp dir explicitly
+        try:
+            log(f"Cleaning up temp: {temp_root}")
+            remove_tree(temp_root)
+        except Exception as e:
+            log(f"Failed to cleanup: {e}")
+        if _LOG_FH is not None:
+            _LOG_FH.close()
+            _LOG_FH = None
+
+if __name__ == "__main__":
+    main()
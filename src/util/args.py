@@ -1,12 +1,15 @@
-from argparse import ArgumentParser
 import sys
+from functools import lru_cache
 
-def args(__version__):
+@lru_cache(maxsize=1)
+def _build_parser(__version__):
     """
-    Parser Argument, recieve argument then parse them, by using argparse lib to manage.
+    Build the ArgumentParser once, later calls reuse it.
+    argparse itself is only imported here.
     Return:
         argparse.ArgumentParser
     """
+    from argparse import ArgumentParser
 
     parser = ArgumentParser(description="Professional Auto Compiler & Runner")
     
@@ -32,30 +35,40 @@ def args(__version__):
     parser.add_argument("-f", "--flags", type=str, default="", help='Compiler flags')
     parser.add_argument("-a", "--argument", type=str, default="", help="Arguments to pass to the executed program")
 
+    return parser
+
+def args(__version__, argv=None):
+    """
+    Parser Argument, recieve argument then parse them, by using argparse lib to manage.
+    Args:
+        argv (list[str] | None): arguments to parse, defaults to sys.argv[1:]
+    Return:
+        argparse.Namespace
+    """
+    parser = _build_parser(__version__)
+
     # Process args manually before parsing
+    argv = sys.argv[1:] if argv is None else list(argv)
+
+    # Common case: no -f given, nothing to rewrite
+    if not any(arg.startswith("-f") for arg in argv):
+        return parser.parse_args(argv)
+
     processed_args = []
-    i = 1
-    while i < len(sys.argv):
-        arg = sys.argv[i]
-        
+    append = processed_args.append
+    it = iter(enumerate(argv))
+    for i, arg in it:
         # Fristly: Parse run -f-Wall -> -f=-Wall
         if arg.startswith("-f") and len(arg) > 2:
-            processed_args.append(f"-f={arg[2:]}")
-            
+            append("-f=" + arg[2:])
+
         # Secondary: Parse space but start with - ex. run -f "-Wall"
-        elif arg == "-f" and i + 1 < len(sys.argv):
-            next_arg = sys.argv[i+1]
-            
-            # If the next arg is -: will force with =
-            if next_arg.startswith("-"):
-                processed_args.append(f"-f={next_arg}")
-                i += 1
-            else:
-                processed_args.append(arg)
-                
+        # If the next arg is -: will force with =
+        elif arg == "-f" and i + 1 < len(argv) and argv[i + 1].startswith("-"):
+            append("-f=" + argv[i + 1])
+            next(it)
+
         else:
-            processed_args.append(arg)
-            
-        i += 1
+            append(arg)
 
     return parser.parse_args(processed_args)
\ No newline at end of file
@@ -1,50 +1,98 @@
-import hashlib
-import json
+import atexit
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+
+CacheEntry = Tuple[int, int, bytes]
 
 from util.output import Printer, Colors
 from util.errors import RunError
 
+# Bump when the hash algorithm or on-disk layout changes, old caches are then ignored
+CACHE_VERSION = 4
+
+def _blake2b_16():
+    """BLAKE2b with a 16 byte digest, used for file content hashes."""
+    import hashlib
+    return hashlib.blake2b(digest_size=16)
+
 class CacheManager:
     """
-    Manages build caching using MD5 checksums.
-    Stores cache data in .run_cache/cache.json relative to the project root or current dir.
+    Manages build caching using BLAKE2b checksums.
+    Stores cache data in .run_cache/cache.pkl relative to the project root or current dir.
     """
     
     def __init__(self, project_root: Path = Path(".")):
-        self.cache_dir = project_root / ".run_cache"
+        # Absolute, so a flush at exit still writes here if the cwd changed meanwhile
+        self.cache_dir = Path(project_root).resolve() / ".run_cache"
         self.objs_dir = self.cache_dir / "objs"
-        self.cache_file = self.cache_dir / "cache.json"
-        self.cache_data: Dict[str, str] = {}
+        self.cache_file = self.cache_dir / "cache.pkl"
+        # absolute source path -> (st_mtime_ns, st_size, raw 16 byte digest)
+        self.cache_data: Dict[str, CacheEntry] = {}
+        self._dirty = False
+        # Entries of changed files hashed by batch_is_changed, taken over by update_cache
+        self._fresh: Dict[str, CacheEntry] = {}
+        # source path -> object path, pure for the lifetime of the manager
+        self._object_paths: Dict[Path, Path] = {}
+        # Pre-initialised BLAKE2b state, copied for every path hash
+        self._path_hasher = None
+        # Set once the directories were created, avoids a stat per call
+        self._objs_dir_ready = False
+        self._cache_dir_ready = False
         self._load_cache()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
+
     def get_object_path(self, source_path: Path) -> Path:
         """
         Get a unique path for the object file in the cache directory.
-        Uses MD5 of output path to ensure uniqueness.
+        Uses BLAKE2b of output path to ensure uniqueness.
         """
+        obj_path = self._object_paths.get(source_path)
+        if obj_path is not None:
+            return obj_path
+
         # We use hash of absolute path to create a unique filename
         # e.g. source.c -> objs/hash_source.o
-        path_hash = hashlib.md5(str(source_path.absolute()).encode()).hexdigest()
+        if self._path_hasher is None:
+            import hashlib
+            self._path_hasher = hashlib.blake2b(digest_size=8)
+        h = self._path_hasher.copy()
+        h.update(os.fsencode(os.path.abspath(source_path)))
+        path_hash = h.hexdigest()
         
-        # Ensure objects dir exists lazily
-        if not self.objs_dir.exists():
+        # Ensure objects dir exists lazily, only tried once
+        if not self._objs_dir_ready:
             try:
                 self.objs_dir.mkdir(parents=True, exist_ok=True)
             except OSError:
                 pass
+            # parents=True also created cache_dir
+            self._objs_dir_ready = True
+            self._cache_dir_ready = True
                 
-        return self.objs_dir / f"{path_hash}_{source_path.name}.o"
+        obj_path = self.objs_dir / f"{path_hash}_{source_path.name}.o"
+        self._object_paths[source_path] = obj_path
+        return obj_path
 
     def _load_cache(self):
         """Load cache from disk."""
         if self.cache_file.exists():
+            import pickle
             try:
-                with open(self.cache_file, "r") as f:
-                    self.cache_data = json.load(f)
-            except (json.JSONDecodeError, IOError):
+                with open(self.cache_file, "rb") as f:
+                    data = pickle.load(f)
+                if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+                    self.cache_data = data.get("files", {})
+                else:
+                    Printer.debug("Cache written by an older version, starting fresh.")
+            except Exception:
+                # Any unreadable pickle (truncated, unknown module, foreign data) just means no cache
                 Printer.warning("Failed to load cache, starting fresh.")
                 self.cache_data = {}
 
@@ -52,77 +100,180 @@ class CacheManager:
         """Save cache to disk."""
         if not self.cache_data:
             # If cache is empty, try to remove cache file and directory
-            if self.cache_file.exists():
-                try:
-                    self.cache_file.unlink()
-                except OSError:
-                    pass
-            
-            # If directory is empty, remove it
-            if self.cache_dir.exists() and not any(self.cache_dir.iterdir()):
-                try:
-                    self.cache_dir.rmdir()
-                except OSError:
-                    pass
+            self._remove_cache_files()
             return
             
-        if not self.cache_dir.exists():
+        if not self._cache_dir_ready:
             try:
                 self.cache_dir.mkdir(parents=True, exist_ok=True)
             except OSError:
                 return # Cannot create cache dir, ignore
+            self._cache_dir_ready = True
         
         try:
-            with open(self.cache_file, "w") as f:
-                json.dump(self.cache_data, f, indent=2)
+            import pickle
+            with open(self.cache_file, "wb") as f:
+                pickle.dump({"version": CACHE_VERSION, "files": self.cache_data}, f, protocol=5)
         except IOError:
             pass # Failed to save, ignore
 
-    def get_file_hash(self, file_path: Path) -> str:
-        """Calculate MD5 hash of a file."""
+    def get_file_hash(self, file_path: Path) -> bytes:
+        """Calculate BLAKE2b digest (raw bytes) of a file."""
         if not file_path.exists():
-            return ""
+            return b""
         
-        hash_md5 = hashlib.md5()
         try:
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
+            import hashlib
+            # file_digest runs the read loop in C with its own buffer
+            with open(file_path, "rb", buffering=0) as f:
+                return hashlib.file_digest(f, _blake2b_16).digest()
         except OSError:
-            return ""
+            return b""
 
     def is_changed(self, file_path: Path) -> bool:
         """
         Check if a file has changed since last cache update.
         Returns True if changed or not in cache, False otherwise.
+        Like ccache, the file is only hashed when its mtime or size differ.
         """
-        key = str(file_path.absolute())
-        current_hash = self.get_file_hash(file_path)
-        
-        if key not in self.cache_data:
+        key = os.path.abspath(file_path)
+        changed, stat_key = self._quick_check(key, file_path)
+        if changed is not None:
+            return changed
+        return self._compare_digest(key, stat_key, self.get_file_hash(file_path))
+
+    def batch_is_changed(self, paths: List[Path]) -> Dict[Path, bool]:
+        """
+        is_changed() for many files at once.
+        Files that fail the mtime/size check and files new to the cache are hashed
+        on a thread pool, hashlib releases the GIL so reads and hashing overlap.
+        Digests of changed files are kept, so update_cache() after the rebuild
+        does not hash them again.
+
+        Args:
+            paths (List[Path]): Source files to check.
+
+        Returns:
+            Dict[Path, bool]: path -> changed.
+        """
+        results: Dict[Path, bool] = {}
+        # (path, key, stat_key, new to the cache)
+        pending = []
+        for path in paths:
+            key = os.path.abspath(path)
+            changed, stat_key = self._quick_check(key, path)
+            if changed is None:
+                pending.append((path, key, stat_key, False))
+                continue
+            results[path] = changed
+            if changed and key not in self.cache_data:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                pending.append((path, key, (st.st_mtime_ns, st.st_size), True))
+
+        if len(pending) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            workers = min(8, os.cpu_count() or 4, len(pending))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                digests = list(executor.map(self.get_file_hash, [p[0] for p in pending]))
+        else:
+            digests = [self.get_file_hash(p[0]) for p in pending]
+
+        # CacheManager is not thread safe: the pool above only hashes files,
+        # cache_data, _fresh and _dirty are updated here on the calling thread
+        for (path, key, stat_key, new), digest in zip(pending, digests):
+            if not new:
+                results[path] = self._compare_digest(key, stat_key, digest)
+            if results[path] and digest:
+                self._fresh[key] = stat_key + (digest,)
+        return results
+
+    def _quick_check(self, key: str, file_path: Path) -> Tuple[Optional[bool], Optional[Tuple[int, int]]]:
+        """
+        The cheap part of is_changed, without hashing.
+        Returns (changed, stat_key), changed is None when only the hash can tell.
+        """
+        cached = self.cache_data.get(key)
+        if cached is None:
+            return True, None
+
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return True, None
+
+        stat_key = (st.st_mtime_ns, st.st_size)
+        if stat_key == cached[:2]:
+            return False, None
+        return None, stat_key
+
+    def _compare_digest(self, key: str, stat_key: Tuple[int, int], digest: bytes) -> bool:
+        """Compare a fresh digest with the cached one, True if the content changed."""
+        if digest != self.cache_data[key][2]:
             return True
-        
-        return self.cache_data[key] != current_hash
+
+        # Touched but same content, remember the new stat so next check is fast
+        self.cache_data[key] = stat_key + (digest,)
+        self._mark_dirty()
+        return False
 
     def update_cache(self, file_path: Path):
-        """Update the cache entry for a file."""
-        key = str(file_path.absolute())
-        self.cache_data[key] = self.get_file_hash(file_path)
-        self._save_cache()
+        """
+        Update the cache entry for a file in memory. Not thread safe.
+        Call flush() (or use the manager as a context manager) to write it to disk.
+        """
+        key = os.path.abspath(file_path)
+        fresh = self._fresh.pop(key, None)
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            self.cache_data.pop(key, None)
+        else:
+            stat_key = (st.st_mtime_ns, st.st_size)
+            # Reuse the batch_is_changed digest unless the file was touched since
+            if fresh is not None and fresh[:2] == stat_key:
+                self.cache_data[key] = fresh
+            else:
+                self.cache_data[key] = stat_key + (self.get_file_hash(file_path),)
+        self._mark_dirty()
+
+    def _mark_dirty(self):
+        """Note unsaved changes, with an exit hook as safety net in case a caller forgets to flush."""
+        if not self._dirty:
+            self._dirty = True
+            atexit.register(self.flush)
+
+    def flush(self):
+        """Write pending cache updates to disk, once."""
+        if self._dirty:
+            self._dirty = False
+            # Nothing left for the exit hook, and the manager need not be kept alive for it
+            atexit.unregister(self.flush)
+            self._save_cache()
 
     def clear(self):
         """Clear all cache."""
         self.cache_data = {}
-        if self.cache_file.exists():
-            try:
-                self.cache_file.unlink()
-            except OSError:
-                pass
-        
-        # If directory is empty, remove it
-        if self.cache_dir.exists() and not any(self.cache_dir.iterdir()):
-            try:
-                self.cache_dir.rmdir()
-            except OSError:
-                pass
+        self._fresh = {}
+        if self._dirty:
+            self._dirty = False
+            atexit.unregister(self.flush)
+        self._remove_cache_files()
+
+    def _remove_cache_files(self):
+        """Remove the cache file, and the cache directory if it is left empty."""
+        # unlink/rmdir fail on their own if there is nothing (or too much) to remove,
+        # so no exists()/iterdir() probing is needed
+        try:
+            self.cache_file.unlink()
+        except OSError:
+            pass
+
+        try:
+            self.cache_dir.rmdir()
+        except OSError:
+            return
+        self._cache_dir_ready = False
+        self._objs_dir_ready = False
@@ -5,11 +5,6 @@ from typing import List, Optional, Dict, Any
 from pathlib import Path
 from util.output import Printer
 
-try:
-    import tomllib
-except ImportError:
-    sys.exit("Error: Python 3.11+ required for tomllib")
-
 class Config:
     """Configuration manager for the runner, handling TOML config loading and retrieval."""
 
@@ -36,22 +31,44 @@ class Config:
             else:
                 return Path.home() / ".config" / "run_kuranne"
 
-    def __init__(self):
-        """Initialize the Config manager, loading Run.toml from detected paths."""
+    def _find_workspace_config(self, start: str) -> Optional[Path]:
+        """
+        Walk up from start looking for Run.toml.
+        Works on plain strings, one stat per level and no Path objects per step.
+
+        Args:
+            start (str): Directory to start from.
+
+        Returns:
+            Optional[Path]: Path to Run.toml if found, else None.
+        """
+        current = start
+        for _ in range(4):  # 0=current, 1=parent, 2=grandparent, 3=great-grandparent
+            target = os.path.join(current, "Run.toml")
+            if os.path.isfile(target):
+                return Path(target)
+
+            parent = os.path.dirname(current)
+            if parent == current:
+                break
+            current = parent
+        return None
+
+    def __init__(self, use_cache: bool = True):
+        """
+        Initialize the Config manager, loading Run.toml from detected paths.
+
+        Args:
+            use_cache (bool): Reuse/store the parsed config in .run_cache/config.pkl.
+        """
         self.data: Dict[str, Any] = {}
-        config_path = None
+        # extension -> language config, built on first lookup
+        self._ext_index: Optional[Dict[str, Dict[str, Any]]] = None
+        # (preset, lang) -> flags, presets don't change during a run
+        self._preset_cache: Dict[tuple, List[str]] = {}
         
         # 1. Search in current workspace (up to 4 levels)
-        current = Path.cwd()
-        for i in range(4):  # 0=current, 1=parent, 2=grandparent, 3=great-grandparent
-            target = current / "Run.toml"
-            if target.exists():
-                config_path = target
-                break
-            
-            if current == current.parent:
-                break
-            current = current.parent
+        config_path = self._find_workspace_config(os.getcwd())
 
         # 2. If not found in workspace, check global config directory
         if not config_path:
@@ -61,16 +78,76 @@ class Config:
                 config_path = global_config_file
         
         if config_path:
-            try:
-                with open(config_path, "rb") as f:
-                    self.data = tomllib.load(f)
+            stamp = None
+            cache_file = config_path.parent / ".run_cache" / "config.pkl"
+            if use_cache:
+                try:
+                    st = config_path.stat()
+                    stamp = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    pass
+
+            cached = self._load_cached_data(cache_file, stamp) if stamp else None
+            if cached is not None:
+                self.data = cached
                 Printer.info(f"Loaded config: {config_path}")
-            except Exception as e:
-                Printer.error(f"Failed to parse {config_path}: {e}")
+            else:
+                # Imported here so runs without any Run.toml, or with a cached one, never load tomllib
+                try:
+                    import tomllib
+                except ImportError:
+                    sys.exit("Error: Python 3.11+ required for tomllib")
+
+                try:
+                    with open(config_path, "rb") as f:
+                        self.data = tomllib.load(f)
+                    Printer.info(f"Loaded config: {config_path}")
+                    if stamp:
+                        self._save_cached_data(cache_file, stamp)
+                except Exception as e:
+                    Printer.error(f"Failed to parse {config_path}: {e}")
             
             # Validate after loading
             self.validate()
 
+    def _load_cached_data(self, cache_file: Path, stamp: tuple) -> Optional[Dict[str, Any]]:
+        """
+        Load previously parsed config data if Run.toml did not change.
+
+        Args:
+            cache_file (Path): Path to config.pkl.
+            stamp (tuple): (st_mtime_ns, st_size) of the current Run.toml.
+
+        Returns:
+            Optional[Dict[str, Any]]: Parsed config, or None on a cache miss.
+        """
+        try:
+            import pickle
+            with open(cache_file, "rb") as f:
+                mtime_ns, size, data = pickle.load(f)
+        except Exception:
+            return None
+
+        if (mtime_ns, size) != stamp or not isinstance(data, dict):
+            return None
+        return data
+
+    def _save_cached_data(self, cache_file: Path, stamp: tuple):
+        """
+        Store parsed config data next to Run.toml for the next run.
+
+        Args:
+            cache_file (Path): Path to config.pkl.
+            stamp (tuple): (st_mtime_ns, st_size) of the parsed Run.toml.
+        """
+        try:
+            import pickle
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, "wb") as f:
+                pickle.dump(stamp + (self.data,), f, protocol=5)
+        except OSError:
+            pass # Cache is optional, ignore
+
     def validate(self):
         """
         Validate the loaded configuration.
@@ -129,13 +206,26 @@ class Config:
             List[str]: List of flags.
         """
         if not preset_name: return []
+        key = (preset_name, lang)
+        cached = self._preset_cache.get(key)
+        if cached is not None:
+            return cached
+
         flags_data = self.data.get("preset", {}).get(preset_name, {}).get(lang, [])
         
         if isinstance(flags_data, list):
-            return flags_data
+            flags = flags_data
         elif isinstance(flags_data, str):
-            return shlex.split(flags_data)
-        return []
+            # shlex is only needed when quoting/escaping is involved
+            if any(c in flags_data for c in ('"', "'", "\\")):
+                flags = shlex.split(flags_data)
+            else:
+                flags = flags_data.split()
+        else:
+            flags = []
+
+        self._preset_cache[key] = flags
+        return flags
     
     def get_custom_languages(self) -> Dict[str, Any]:
         """
@@ -156,15 +246,25 @@ class Config:
         Returns:
             Optional[Dict[str, Any]]: Language configuration dictionary including name, or None if not found.
         """
-        languages = self.get_custom_languages()
-        for lang_name, lang_config in languages.items():
-            extensions = lang_config.get("extensions", [])
-            if ext in extensions:
-                return {
-                    "name": lang_name,
-                    **lang_config
-                }
-        return None
+        if self._ext_index is None:
+            self._build_ext_index()
+        return self._ext_index.get(ext)
+
+    def _build_ext_index(self):
+        """Build the extension -> language config index (first declared language wins)."""
+        self._ext_index = {}
+        for lang_name, lang_config in self.get_custom_languages().items():
+            entry = {
+                "name": lang_name,
+                **lang_config
+            }
+            for ext in lang_config.get("extensions", []):
+                self._ext_index.setdefault(ext, entry)
+
+    def _invalidate_lookups(self):
+        """Drop the extension index and preset cache, call after changing self.data."""
+        self._ext_index = None
+        self._preset_cache = {}
     
     def is_custom_language_configured(self, ext: str) -> bool:
         """
@@ -176,7 +276,9 @@ class Config:
         Returns:
             bool: True if configured, False otherwise.
         """
-        return self.get_language_by_extension(ext) is not None
+        if self._ext_index is None:
+            self._build_ext_index()
+        return ext in self._ext_index
     
     def get_exclude(self) -> Optional[Dict[str, Any]]:
         """
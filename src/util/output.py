@@ -1,5 +1,7 @@
 import logging
+import os
 import sys
+from functools import lru_cache
 
 class Colors:
     """ANSI color codes for terminal output."""
@@ -11,6 +13,20 @@ class Colors:
     RESET = '\033[0m'
     BOLD = '\033[1m'
 
+# Decided once: no ANSI codes when piped/redirected or when NO_COLOR is set
+_USE_COLOR = sys.stdout.isatty() and os.environ.get("NO_COLOR") is None
+
+@lru_cache(maxsize=None)
+def _prefix(tag: str, color: str, use_color: bool) -> str:
+    """Build the '[ TAG ] ' prefix once per tag/color, colored only when writing to a terminal."""
+    if not use_color:
+        return f"[ {tag} ] "
+    return f"{Colors.BOLD}{color}[ {tag} ]{Colors.RESET} "
+
+def _fmt(tag: str, color: str, message: str) -> str:
+    """Build a '[ TAG ] message' line from the cached prefix."""
+    return _prefix(tag, color, _USE_COLOR) + message
+
 class TaggedFormatter(logging.Formatter):
     """Custom formatter to replicate [ TAG ] Message style."""
     
@@ -25,14 +41,11 @@ class TaggedFormatter(logging.Formatter):
     def format(self, record):
         # Allow custom tag override via extra={'tag': 'MYTAG', 'color': ...}
         tag, color = self.TAGS.get(record.levelno, ("LOG", Colors.RESET))
-        
-        if hasattr(record, 'tag'):
-            tag = record.tag
-        if hasattr(record, 'color'):
-            color = record.color
+        tag = getattr(record, 'tag', tag)
+        color = getattr(record, 'color', color)
             
         message = super().format(record)
-        return f"{Colors.BOLD}{color}[ {tag} ]{Colors.RESET} {message}"
+        return _fmt(tag, color, message)
 
 # Setup root logger
 logger = logging.getLogger("run_kuranne")
@@ -41,41 +54,67 @@ handler = logging.StreamHandler(sys.stdout)
 handler.setFormatter(TaggedFormatter())
 logger.addHandler(handler)
 
+# Only debug output goes through logging; set by enable_debug() for --debug
+_DEBUG_ENABLED = False
+
+def enable_debug():
+    """Turn on debug output for Printer.debug."""
+    global _DEBUG_ENABLED
+    _DEBUG_ENABLED = True
+    logger.setLevel(logging.DEBUG)
+
+def _write(tag: str, color: str, message: str):
+    """Write a tagged line straight to stdout, bypassing logging."""
+    sys.stdout.write(Printer.format_line(tag, message, color) + "\n")
+    # Flushed per line like StreamHandler, so tags stay in order with child output when piped
+    sys.stdout.flush()
+
 class Printer:
-    """Utility class wrapper for logging."""
+    """Tagged console output; only debug messages go through logging."""
+    @staticmethod
+    def format_line(tag: str, message: str, color: str = Colors.GREEN) -> str:
+        """Return the '[ TAG ] message' line Printer writes, without the newline."""
+        return _fmt(tag, color, message)
+
     @staticmethod
     def action(tag: str, message: str, color: str = Colors.GREEN):
         """Print an action with a tagged prefix."""
-        # We use INFO level but override tag/color
-        logger.info(message, extra={'tag': tag, 'color': color})
+        _write(tag, color, message)
 
     @staticmethod
     def time(seconds: float):
         """Print execution time."""
         # Direct print for time to avoid logger format, or we can use a helper
-        print(f"{Colors.GRAY}  -> Took {seconds:.3f}s{Colors.RESET}")
+        if _USE_COLOR:
+            print(f"{Colors.GRAY}  -> Took {seconds:.3f}s{Colors.RESET}")
+        else:
+            print(f"  -> Took {seconds:.3f}s")
 
     @staticmethod
     def error(message: str):
         """Print an error message."""
-        logger.error(message)
+        _write("ERROR", Colors.RED, message)
     
     @staticmethod
     def info(message: str):
         """Print an informational message."""
-        logger.info(message)
+        _write("INFO", Colors.CYAN, message)
 
     @staticmethod
     def warning(message: str):
         """Print a warning message."""
-        logger.warning(message)
+        _write("WARN", Colors.YELLOW, message)
         
     @staticmethod
     def debug(message: str):
         """Print debug message (only if level is DEBUG)."""
-        logger.debug(message)
+        if _DEBUG_ENABLED:
+            logger.debug(message)
 
     @staticmethod
     def separator():
         """Print a visual separator line."""
-        print(f"\n{Colors.GRAY}{'-'*30}{Colors.RESET}\n")
+        if _USE_COLOR:
+            print(f"\n{Colors.GRAY}{'-'*30}{Colors.RESET}\n")
+        else:
+            print(f"\n{'-'*30}\n")
@@ -1,12 +1,15 @@
 import os
 import sys
-from typing import List, Dict, Optional
+from typing import List, Dict, Mapping, Optional
 from util.output import Printer, Colors
 from util.errors import ConfigError
 
 class SecurityManager:
     """Manages security checks and enforcement for the runner."""
 
+    # Sanitized environment, built on first use
+    _cached_env: Optional[Dict[str, str]] = None
+
     @staticmethod
     def check_root(allow_root: bool = False):
         """Check if the script is running as root/admin."""
@@ -33,21 +36,30 @@ class SecurityManager:
                  Printer.error(msg)
                  raise ConfigError("Execution as root is blocked. Use --unsafe to override (not yet implemented).")
 
-    @staticmethod
-    def sanitize_execution_env() -> Dict[str, str]:
+    @classmethod
+    def sanitize_execution_env(cls, env: Optional[Mapping[str, str]] = None) -> Dict[str, str]:
         """
         Return a sanitized environment dictionary for subprocess execution.
         Removing potentially dangerous variables if necessary.
+        The result for os.environ is built once and reused for every later subprocess of this run.
         
+        Args:
+            env (Mapping[str, str], optional): Environment to sanitize. Defaults to os.environ.
+            
         Returns:
-            Dict[str, str]: Copy of os.environ with sensitive keys removed/sanitized.
+            Dict[str, str]: Copy of the environment with sensitive keys removed/sanitized.
         """
-        env = os.environ.copy()
+        if env is not None:
+            return cls._strip_env(env)
+        if cls._cached_env is None:
+            cls._cached_env = cls._strip_env(os.environ)
+        return cls._cached_env
+
+    @staticmethod
+    def _strip_env(env: Mapping[str, str]) -> Dict[str, str]:
         # For a general purpose runner, we usually pass through everything.
         # But we might want to strip LD_PRELOAD just in case.
-        if "LD_PRELOAD" in env:
-            del env["LD_PRELOAD"]
-        return env
+        return {k: v for k, v in env.items() if k != "LD_PRELOAD"}
 
     @staticmethod
     def check_suspicious_flags(flags: List[str]) -> bool:
@@ -1,140 +1,128 @@
-import requests
 import os
 import sys
-import zipfile
-import tempfile
-import shutil
 import subprocess
 import time
 from pathlib import Path
+from typing import Optional
 from util.output import Printer, Colors
 import json
 
-UPDATE_SCRIPT_TEMPLATE = """
-import os
-import sys
-import shutil
-import time
-import subprocess
-import json
-import re
-from pathlib import Path
+# requests, zipfile, tempfile and shutil are imported inside the functions that
+# use them: update only runs with --update, and requests alone is slow to import.
 
-def log(msg):
-    try:
-        with open(r"{log_file}", "a", encoding="utf-8") as f:
-            f.write(str(msg) + "\\n")
-    except:
-        pass
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+DOWNLOAD_ATTEMPTS = 3
+# (connect, read) seconds, a stalled stream raises and gets resumed
+DOWNLOAD_TIMEOUT = (5, 30)
+# Transient gateway errors, retried like a dropped connection
+RETRY_STATUSES = frozenset({502, 503, 504})
 
-def force_remove(path):
-    if not path.exists(): return
-    try:
-        if path.is_dir() and not path.is_symlink():
-            # Fix read-only files before removing
-            def unlink_readonly(func, path, excinfo):
-                os.chmod(path, 0o777)
-                func(path)
-            shutil.rmtree(path, onerror=unlink_readonly)
-        else:
-            os.chmod(path, 0o777) if os.name != 'nt' else None
-            os.remove(path)
-    except Exception as e:
-        log(f"Error removing {{path}}: {{e}}")
-        time.sleep(1)
+_SESSION = None
 
-def refresh_pyproject_toml(path, content):
-    try:
-        path.write_text(content, encoding="utf-8")
-        log(f"Refreshed pyproject.toml content.")
-    except Exception as e:
-        log(f"Failed to refresh pyproject.toml: {{e}}")
+# Entry script of the background updater, the logic lives in _updater_payload.py
+UPDATER_BOOTSTRAP = """from _updater_payload import main
 
-def main():
-    log("Starting update process...")
-    
-    # Wait for parent process to exit
-    pid = {parent_pid}
-    log(f"Waiting for parent process {{pid}} to exit...")
-    try:
-        while True:
-            try:
-                os.kill(pid, 0)
-                time.sleep(0.5)
-            except OSError:
-                break
-    except Exception as e:
-        log(f"Error waiting for process: {{e}}")
-    
-    # Give it an extra second to release file locks (important on Windows)
-    time.sleep(1)
-    
-    src_dir = Path(r"{src_dir}")
-    install_dir = Path(r"{install_dir}")
-    temp_root = Path(r"{temp_root}")
-    
+main()
+"""
+
+def _get_session():
+    """
+    Return the shared requests.Session, so update requests reuse pooled connections.
+    The adapter does not retry: the archive download has its own retry loop, which
+    resumes where the transfer stopped.
+    """
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        _SESSION = requests.Session()
+        _SESSION.mount("https://", adapter)
+    return _SESSION
+
+def _archive_cache_dir() -> Optional[Path]:
+    """
+    Private per-user directory for update state, the release archives and the ETag
+    cache (~/.cache/run/updates, or under $XDG_CACHE_HOME). Created with mode 0700;
+    None when it cannot be used safely, i.e. it is not owned by this user or cannot be created.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    cache_dir = Path(base) / "run" / "updates"
     try:
-        log(f"Copying files from {{src_dir}} to {{install_dir}}")
-        
-        # Copy logic: Iterate source and overwrite destination
-        for item in src_dir.iterdir():
-            dest = install_dir / item.name
-            
-            if dest.exists():
-                force_remove(dest)
-                
-            if item.is_dir():
-                shutil.copytree(item, dest, dirs_exist_ok=True)
-            else:
-                shutil.copy2(item, dest)
-        
-        log("Files copied successfully.")
+        cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if hasattr(os, "getuid"):
+            st = cache_dir.stat()
+            if st.st_uid != os.getuid():
+                return None
+            if st.st_mode & 0o077:
+                os.chmod(cache_dir, 0o700)
+    except OSError:
+        return None
+    return cache_dir
 
-        # Explicitly refresh full pyproject.toml (safeguard)
-        refresh_pyproject_toml(install_dir / "pyproject.toml", json.loads(r'{remote_pyproject_content_json}'))
-        
-        # Run setup
-        setup_script = install_dir / ("setup.ps1" if os.name == "nt" else "setup.sh")
-        if setup_script.exists():
-            log(f"Running setup script: {{setup_script}}")
-            
-            if os.name != "nt":
-                os.chmod(setup_script, 0o755)
-                cmd = ["/bin/bash", str(setup_script)]
-            else:
-                cmd = ["powershell", "-ExecutionPolicy", "Bypass", "-File", str(setup_script)]
-            
-            # Run setup but don't fail the whole update if setup script has minor errors
-            try:    
-                subprocess.run(cmd, check=True, cwd=install_dir)
-                log("Setup completed successfully.")
-            except subprocess.CalledProcessError as e:
-                log(f"Setup script returned error: {{e}} (Update files likely preserved)")
-        
-    except Exception as e:
-        log(f"CRITICAL UPDATE FAILED: {{e}}")
-        # Optional: Try to rollback here if you had a backup
-        sys.exit(1)
-    finally:
-        # Cleanup temp dir explicitly
-        try:
-            log(f"Cleaning up temp: {{temp_root}}")
-            shutil.rmtree(temp_root, ignore_errors=True)
-        except Exception as e:
-            log(f"Failed to cleanup: {{e}}")
+def _etag_cache_file() -> Optional[Path]:
+    """
+    Path of the JSON file holding the validators of the last pyproject.toml fetch.
+    Its content is trusted on a 304, so it only lives in the private cache dir;
+    None when that is unavailable.
+    """
+    cache_dir = _archive_cache_dir()
+    return cache_dir / "etag.json" if cache_dir is not None else None
 
-if __name__ == "__main__":
-    main()
-"""
+def _load_etag_cache() -> dict:
+    """Load the conditional request cache, empty if missing, unreadable or unavailable."""
+    path = _etag_cache_file()
+    if path is None:
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def _save_etag_cache(cache: dict):
+    """Write the conditional request cache, failures are ignored."""
+    path = _etag_cache_file()
+    if path is None:
+        return
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
 
 def _get_remote_pyproject_data(repo: str, branch: str = "main") -> tuple[str, str]:
-    """Fetch version and full content from pyproject.toml in the repository."""
+    """
+    Fetch version and full content from pyproject.toml in the repository.
+    The ETag/Last-Modified of the previous response are sent back, so an
+    unchanged file comes back as a body-less 304 and the cached copy is used.
+    """
     raw_url = f"https://raw.githubusercontent.com/{repo}/{branch}/pyproject.toml"
-    
-    response = requests.get(raw_url, timeout=5)
-    response.raise_for_status()
-    
-    content = response.text
+
+    etag_cache = _load_etag_cache()
+    key = f"{repo}@{branch}"
+    entry = etag_cache.get(key) or {}
+
+    headers = {}
+    if entry.get("content") is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = _get_session().get(raw_url, headers=headers, timeout=5)
+    if response.status_code == 304 and headers:
+        content = entry["content"]
+    else:
+        response.raise_for_status()
+        content = response.text
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            etag_cache[key] = {"etag": etag, "last_modified": last_modified, "content": content}
+            _save_etag_cache(etag_cache)
     
     # Parse pyproject.toml from the response text
     if sys.version_info >= (3, 11):
@@ -150,43 +138,228 @@ def _get_remote_pyproject_data(repo: str, branch: str = "main") -> tuple[str, st
         raise ValueError(f"Failed to parse pyproject.toml from {raw_url}: {e}")
 
 
-def _download_file(url: str, dest_path: Path):
-    """Download a file from a URL to a specified path."""
-    with requests.get(url, stream=True) as r:
+def _get_expected_digest(repo: str, archive_name: str, branch: str = "main") -> Optional[str]:
+    """
+    Fetch the published SHA-256 of the release archive from checksums.txt, if any.
+    The file uses sha256sum's "<hex>  <name>" lines; the line for archive_name wins,
+    a file holding only a bare digest is accepted too.
+    Returns None when the repository does not publish one for archive_name.
+    """
+    raw_url = f"https://raw.githubusercontent.com/{repo}/{branch}/checksums.txt"
+    response = _get_session().get(raw_url, timeout=5)
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+
+    lines = [line.split() for line in response.text.splitlines() if line.strip()]
+    for fields in lines:
+        if len(fields) > 1 and fields[-1].lstrip("*") == archive_name:
+            return fields[0].lower()
+    # A bare digest with no name is taken as the one for this archive
+    if len(lines) == 1 and len(lines[0]) == 1:
+        return lines[0][0].lower()
+    return None
+
+def _download_file(url: str, dest_path: Path) -> str:
+    """
+    Download a file from a URL to a specified path.
+    Dropped connections and gateway errors are retried with backoff, and a retry
+    resumes from the bytes already on disk with an HTTP Range request.
+
+    Returns:
+        str: Hex SHA-256 digest of the downloaded bytes.
+    """
+    import requests
+
+    for attempt in range(DOWNLOAD_ATTEMPTS):
+        try:
+            return _download_attempt(url, dest_path)
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError,
+                requests.HTTPError) as e:
+            if attempt == DOWNLOAD_ATTEMPTS - 1:
+                raise
+            if isinstance(e, requests.HTTPError) and getattr(e.response, "status_code", None) not in RETRY_STATUSES:
+                raise
+            delay = 2 ** attempt
+            Printer.debug(f"Download interrupted ({e}), retrying in {delay}s...")
+            time.sleep(delay)
+
+def _download_attempt(url: str, dest_path: Path) -> str:
+    """
+    One download try, appending to a partial dest_path when the server honours Range.
+    The SHA-256 digest is computed while streaming, only a resumed prefix is re-read.
+    """
+    import hashlib
+
+    try:
+        existing = dest_path.stat().st_size
+    except FileNotFoundError:
+        existing = 0
+
+    headers = {"Range": f"bytes={existing}-"} if existing else {}
+    digest = hashlib.sha256()
+    with _get_session().get(url, stream=True, headers=headers, timeout=DOWNLOAD_TIMEOUT) as r:
+        if existing and r.status_code == 416:
+            # Nothing left past our bytes: the file is complete, the caller verifies it
+            return _file_sha256(dest_path)
         r.raise_for_status()
-        with open(dest_path, "wb") as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                f.write(chunk)
+        if existing and r.status_code == 206:
+            with open(dest_path, "rb", buffering=0) as f:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                # file_digest runs the read loop in C, the hash then keeps going below
+                digest = hashlib.file_digest(f, "sha256")
+            mode = "ab"
+        else:
+            # 200: the server sent the whole file, start over
+            mode = "wb"
+
+        # Chunks are already 1 MiB, so skip Python's buffer: one write(2) per chunk
+        with open(dest_path, mode, buffering=0) as f:
+            for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                view = memoryview(chunk)
+                while view:
+                    view = view[f.write(view):]
+                digest.update(chunk)
+    return digest.hexdigest()
+
+def _file_sha256(path: Path) -> str:
+    """Hex SHA-256 of a file already on disk."""
+    import hashlib
+    with open(path, "rb", buffering=0) as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+def _common_top_dir(names: list[str]) -> str:
+    """Return the single top-level folder ("name/") shared by all zip entries, or ""."""
+    if not names:
+        return ""
+    top = names[0].split("/", 1)[0] + "/"
+    return top if all(name.startswith(top) for name in names) else ""
 
 def _extract_zip(zip_path: Path, extract_to: Path) -> Path:
-    """Extract a zip file and return the path to the content."""
+    """
+    Extract a zip file and return the path to the content.
+    GitHub archives wrap everything in one "<repo>-<tag>/" folder, that prefix is
+    stripped and every member is streamed straight to its final path (one write per file).
+    """
+    import zipfile
+    import shutil
+
+    extract_to.mkdir(parents=True, exist_ok=True)
+    # Directories already created, so each one costs a single mkdir call
+    made_dirs = {extract_to}
     with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_ref.extractall(extract_to)
-    
-    extracted_items = list(extract_to.iterdir())
-    if len(extracted_items) == 1 and extracted_items[0].is_dir():
-        return extracted_items[0]
+        infos = zip_ref.infolist()
+        prefix = _common_top_dir([info.filename for info in infos])
+
+        for info in infos:
+            rel = os.path.normpath(info.filename[len(prefix):])
+            # Skip the prefix folder itself and anything escaping extract_to
+            if rel == "." or os.path.isabs(rel) or rel.split(os.sep, 1)[0] == "..":
+                continue
+
+            target = extract_to / rel
+            directory = target if info.is_dir() else target.parent
+            if directory not in made_dirs:
+                directory.mkdir(parents=True, exist_ok=True)
+                made_dirs.add(directory)
+            if info.is_dir():
+                continue
+
+            with zip_ref.open(info) as src, open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst, length=DOWNLOAD_CHUNK_SIZE)
+
+            # Keep permission bits (e.g. executable setup.sh)
+            mode = (info.external_attr >> 16) & 0o777
+            if mode:
+                os.chmod(target, mode)
+
     return extract_to
 
+def _spawn_detached(argv: list[str]):
+    """
+    Start argv fully detached from this process (POSIX double fork).
+    The intermediate child is reaped right away, the grandchild gets its own
+    session, /dev/null as stdio and is adopted by init.
+
+    Args:
+        argv (list[str]): Program and arguments, argv[0] must be a path.
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid:
+        os.waitpid(pid, 0)
+        return
+
+    # Only os._exit from here on, the child must never return into the caller
+    try:
+        os.setsid()
+        if os.fork():
+            os._exit(0)
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        if devnull > 2:
+            os.close(devnull)
+        os.execv(argv[0], argv)
+    finally:
+        os._exit(1)
+
+class _UpdateStatus:
+    """
+    Status lines of one update run. On a terminal they are printed right away,
+    otherwise they are collected and written in one go by flush().
+    """
+    __slots__ = ("interactive", "lines")
+
+    def __init__(self):
+        self.interactive = sys.stdout.isatty()
+        self.lines = []
+
+    def action(self, tag: str, message: str, color: str = Colors.GREEN):
+        if self.interactive:
+            Printer.action(tag, message, color)
+        else:
+            # Same line Printer would write, kept for flush()
+            self.lines.append(Printer.format_line(tag, message, color))
+
+    def info(self, message: str):
+        self.action("INFO", message, Colors.CYAN)
+
+    def warning(self, message: str):
+        self.action("WARN", message, Colors.YELLOW)
+
+    def flush(self):
+        """Write the collected lines with a single write."""
+        if self.lines:
+            sys.stdout.write("\n".join(self.lines) + "\n")
+            self.lines.clear()
+
 def update(repo: str, current_version: str):
     """
-    Update the runner by checking version.txt and downloading the source zip.
+    Update the runner by checking the remote pyproject.toml and downloading the source zip.
     """
+    import requests
+    import tempfile
+
+    status = _UpdateStatus()
     try:
-        Printer.action("CHECK", f"Checking for updates... (Current: {current_version})", Colors.CYAN)
+        status.action("CHECK", f"Checking for updates... (Current: {current_version})", Colors.CYAN)
         
         latest_version, remote_content = _get_remote_pyproject_data(repo=repo)
         
         if latest_version == current_version:
-            Printer.action("UPDATE", "You are already on the latest version.")
+            status.action("UPDATE", "You are already on the latest version.")
             return
 
-        Printer.warning(f"New version available: {latest_version}")
+        status.warning(f"New version available: {latest_version}")
+        status.flush()
         if input("Update?[y/N]: ") not in ("y", "Y"):
             return
 
         # Handle tags with or without 'v' prefix if needed
-        # GitHub tags might be "v1.0.0" but version.txt is "1.0.0"
+        # GitHub tags might be "v1.0.0" but pyproject.toml has "1.0.0"
         tag_name = latest_version
         if not tag_name.startswith("v") and "." in tag_name: 
             # Check logic here depends on your repo naming convention
@@ -195,58 +368,95 @@ def update(repo: str, current_version: str):
 
         download_url = f"https://github.com/{repo}/archive/refs/tags/{tag_name}.zip"
 
-        check = requests.head(download_url, allow_redirects=True)
+        session = _get_session()
+        check = session.head(download_url, allow_redirects=True, timeout=5)
         if check.status_code == 404 and not tag_name.startswith("v"):
             tag_name = f"v{latest_version}"
             download_url = f"https://github.com/{repo}/archive/refs/tags/{tag_name}.zip"
+            check = session.head(download_url, allow_redirects=True, timeout=5)
 
-        Printer.action("DOWNLOAD", f"Downloading {latest_version}...", Colors.YELLOW)
-        
         temp_dir = tempfile.mkdtemp(prefix="run_update_")
         temp_dir_path = Path(temp_dir)
-        temp_zip = temp_dir_path / "release.zip"
         extract_path = temp_dir_path / "extracted"
-        
-        _download_file(download_url, temp_zip)
-        content_path = _extract_zip(temp_zip, extract_path)
+
+        # The archive is kept across runs in a private cache, but a complete one is only
+        # reused when it matches the published digest. Without one it could never be
+        # reused, so it goes to the temp dir, which the updater removes after installing
+        expected_digest = _get_expected_digest(repo=repo, archive_name=f"{tag_name}.zip")
+        cache_root = _archive_cache_dir()
+        cache_dir = cache_root if expected_digest else None
+        archive = (cache_dir or temp_dir_path) / f"{latest_version}.zip"
+        remote_size = check.headers.get("Content-Length")
+        local_size = archive.stat().st_size if archive.is_file() else None
+
+        if local_size and (not remote_size or local_size == int(remote_size)) \
+                and _file_sha256(archive) == expected_digest:
+            status.action("CACHE", f"Reusing downloaded {latest_version} archive", Colors.CYAN)
+            digest = expected_digest
+        else:
+            # Only a confirmed partial download is resumed, anything else failed the check
+            if local_size and not (remote_size and local_size < int(remote_size)):
+                archive.unlink()
+            status.action("DOWNLOAD", f"Downloading {latest_version}...", Colors.YELLOW)
+            digest = _download_file(download_url, archive)
+        Printer.debug(f"Archive SHA-256: {digest}")
+
+        if expected_digest and expected_digest != digest:
+            archive.unlink(missing_ok=True)
+            raise ValueError(f"Downloaded archive digest mismatch (expected {expected_digest}, got {digest})")
+
+        # Archives of other versions (or unverifiable ones) will not be needed again
+        if cache_root is not None:
+            for old_archive in cache_root.glob("*.zip"):
+                if old_archive != archive:
+                    old_archive.unlink(missing_ok=True)
+
+        content_path = _extract_zip(archive, extract_path)
 
         install_dir = Path(__file__).resolve().parent.parent.parent
         
         log_dir = Path(tempfile.gettempdir())
         log_file = log_dir / "run_update.log"
 
-        # Insert r (raw string) at the front of path in template -> Prevent escape characters
-        # Then send temp_dir_path from parent to cleanup
-        script_content = UPDATE_SCRIPT_TEMPLATE.format(
-            log_file=log_file.as_posix(),
-            parent_pid=os.getpid(),
-            src_dir=content_path.as_posix(),
-            install_dir=install_dir.as_posix(),
-            temp_root=temp_dir_path.as_posix(),
-            latest_version=latest_version,
-            remote_pyproject_content_json=json.dumps(remote_content)
-        )
-        
+        # The updater is a real module driven by command line arguments. It is copied
+        # into the temp dir because the install dir it would run from gets replaced
+        import shutil
+        shutil.copy2(Path(__file__).with_name("_updater_payload.py"), temp_dir_path / "_updater_payload.py")
+        pyproject_file = temp_dir_path / "pyproject.toml"
+        pyproject_file.write_text(remote_content, encoding="utf-8")
+
         script_path = temp_dir_path / "updater.py"
-        with open(script_path, "w", encoding="utf-8") as f:
-            f.write(script_content)
+        script_path.write_text(UPDATER_BOOTSTRAP, encoding="utf-8")
+        updater_args = [
+            "--log-file", str(log_file),
+            "--parent-pid", str(os.getpid()),
+            "--src-dir", str(content_path),
+            "--install-dir", str(install_dir),
+            "--temp-root", str(temp_dir_path),
+            "--pyproject-file", str(pyproject_file),
+        ]
             
-        Printer.action("INSTALL", f"Starting background update process...", Colors.CYAN)
-        Printer.info(f"The application will exit now. Check {log_file} for status.")
+        status.action("INSTALL", f"Starting background update process...", Colors.CYAN)
+        status.info(f"The application will exit now. Check {log_file} for status.")
         
         # sys.executable ensure that same python
         python_exe = sys.executable
         
         if sys.platform == "win32":
              # Use CREATE_NEW_CONSOLE to detach effectively
-             subprocess.Popen([python_exe, str(script_path)], creationflags=subprocess.CREATE_NEW_CONSOLE)
+             subprocess.Popen([python_exe, str(script_path), *updater_args], creationflags=subprocess.CREATE_NEW_CONSOLE)
         else:
-             # Use start_new_session to detach
-             subprocess.Popen([python_exe, str(script_path)], start_new_session=True)
+             # Double fork so the updater is reparented to init and never left a zombie
+             _spawn_detached([python_exe, str(script_path), *updater_args])
              
         sys.exit(0)
         
     except requests.RequestException as e:
+        status.flush()
         Printer.error(f"Network error: {e}")
     except Exception as e:
-        Printer.error(f"Failed to update: {e}")
\ No newline at end of file
+        status.flush()
+        Printer.error(f"Failed to update: {e}")
+    finally:
+        # Covers the early returns
+        status.flush()
\ No newline at end of file
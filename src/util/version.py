@@ -1,16 +1,63 @@
+import os
+import re
 import sys
 from pathlib import Path
-
-if sys.version_info >= (3, 11):
-    import tomllib
-else:
-    import tomldecoder as tomllib  # Fallback if needed, though project requires 3.11+
+from typing import Dict, Final, Optional, Tuple
 
 from util.output import Printer
 
-fp = Path(__file__).resolve().parent.parent.parent / "pyproject.toml"
+# Resolved once at import, the default argument below reuses it
+_FP: Final[Path] = Path(__file__).resolve().parent.parent.parent / "pyproject.toml"
+
+# (path, st_mtime_ns) -> version, editing the file changes the key
+_VERSION_CACHE: Dict[Tuple[str, int], Optional[str]] = {}
+
+# Plain `[table]` header and `version = "x"` lines, enough for a normal pyproject.toml;
+# anything else falls back to tomllib
+_TABLE_RE = re.compile(r'\[\s*([\w.\-]+)\s*\]\s*(?:#.*)?')
+_VERSION_RE = re.compile(r'version\s*=\s*"([^"\\]*)"\s*(?:#.*)?')
+
+def _parse_version(text: str) -> Optional[str]:
+    """
+    Return [project].version of a pyproject.toml text.
+    version() runs on every start, so simple files are read with a line scan and
+    tomllib is only imported for anything the scan cannot handle.
+    """
+    table = None
+    for line in text.splitlines():
+        # Array-of-tables headers and multi-line strings are beyond the scan
+        if line.lstrip().startswith("[[") or '"""' in line or "'''" in line:
+            break
+        match = _TABLE_RE.fullmatch(line)
+        if match:
+            table = match.group(1)
+        elif table == "project":
+            match = _VERSION_RE.fullmatch(line)
+            if match:
+                return match.group(1)
+
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:
+        import tomldecoder as tomllib  # Fallback if needed, though project requires 3.11+
+    return tomllib.loads(text).get("project", {}).get("version")
+
+def _cached_parse(file_path: Path) -> Optional[str]:
+    """
+    Return the project version of file_path, parsing the TOML only when the
+    file is new or its mtime changed. A hit costs one os.stat.
+    """
+    key = (str(file_path), os.stat(file_path).st_mtime_ns)
+    try:
+        return _VERSION_CACHE[key]
+    except KeyError:
+        pass
+
+    result = _parse_version(file_path.read_text(encoding="utf-8"))
+    _VERSION_CACHE[key] = result
+    return result
 
-def version(file_path: Path = fp) -> str:
+def version(file_path: Path = _FP) -> str:
     """
     Read the version in pyproject.toml
 
@@ -20,10 +67,7 @@ def version(file_path: Path = fp) -> str:
         str: data in the file
     """
     try:        
-        with open(file_path, "rb") as f:
-            data = tomllib.load(f)
-            __version__ = data.get("project", {}).get("version")
-            return __version__
+        return _cached_parse(file_path)
 
     except FileNotFoundError:
         Printer.warning(f"Not found {str(file_path)} in binary directory, please reinstall run")
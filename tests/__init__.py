@@ -0,0 +1,68 @@
+"""
+Test package.
+
+Setting RUN_SLOW_SKIP_MS turns on a per-host skip list: a test running longer than
+that many milliseconds is appended to tests/.skipfile.txt, and tests listed there
+are skipped on later runs. Delete the file to run everything again.
+
+Modules that drive compilers run after the rest, so a trivial breakage is reported first.
+"""
+import os
+import time
+import unittest
+
+SKIPFILE = os.path.join(os.path.dirname(__file__), ".skipfile.txt")
+
+# Modules that run real or fake compilers, ordered after the unit tests
+SLOW_MODULES = {"tests.test_integration", "tests.test_no_cache_flag"}
+
+def _iter_tests(suite):
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from _iter_tests(test)
+        else:
+            yield test
+
+def _read_skipfile():
+    try:
+        with open(SKIPFILE) as f:
+            return {line.strip() for line in f if line.strip()}
+    except OSError:
+        return set()
+
+def _record_if_slow(test, threshold_ms):
+    run = test.run
+
+    def timed_run(result=None):
+        start = time.perf_counter()
+        try:
+            return run(result)
+        finally:
+            if (time.perf_counter() - start) * 1000 > threshold_ms:
+                with open(SKIPFILE, "a") as f:
+                    f.write(test.id() + "\n")
+
+    test.run = timed_run
+
+def load_tests(loader, standard_tests, pattern):
+    this_dir = os.path.dirname(__file__)
+    suite = loader.discover(start_dir=this_dir, pattern=pattern or "test*.py",
+                            top_level_dir=os.path.dirname(this_dir))
+
+    threshold = os.environ.get("RUN_SLOW_SKIP_MS")
+    if threshold:
+        skipped = _read_skipfile()
+        for test in _iter_tests(suite):
+            name = getattr(test, "_testMethodName", None)
+            if name is None:
+                continue
+            if test.id() in skipped:
+                # An instance attribute wins over the class method in TestCase.run
+                setattr(test, name, unittest.skip("listed in tests/.skipfile.txt")(getattr(test, name)))
+            else:
+                _record_if_slow(test, float(threshold))
+
+    # sorted() is stable: discovery order is kept within each group, and tests of one
+    # class stay adjacent so class fixtures still run once
+    standard_tests.addTests(sorted(_iter_tests(suite), key=lambda t: type(t).__module__ in SLOW_MODULES))
+    return standard_tests
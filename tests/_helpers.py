@@ -0,0 +1,15 @@
+"""Shared setup for the test modules that build and run programs."""
+import os
+import shutil
+import sys
+from functools import cache
+
+# Object files and the cache are I/O bound, keep them on tmpfs where there is one.
+# The tests execute what they build, so a noexec /dev/shm is no use.
+TMPDIR = ("/dev/shm" if sys.platform.startswith("linux") and os.path.isdir("/dev/shm")
+          and not os.statvfs("/dev/shm").f_flag & os.ST_NOEXEC else None)
+
+@cache
+def gcc_path():
+    """Path of gcc, the PATH lookup is done once per test run."""
+    return shutil.which("gcc")
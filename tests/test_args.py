@@ -0,0 +1,37 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from util.args import args
+
+class TestArgs(unittest.TestCase):
+    def parse(self, *argv):
+        with patch.object(sys, "argv", ["run", *argv]):
+            return args("0.0.0")
+
+    def test_no_flags(self):
+        parsed = self.parse("main.c", "-m")
+        self.assertEqual(parsed.files, ["main.c"])
+        self.assertTrue(parsed.multi)
+        self.assertEqual(parsed.flags, "")
+
+    def test_attached_flags(self):
+        self.assertEqual(self.parse("main.c", "-f-Wall").flags, "-Wall")
+
+    def test_separate_dash_flags(self):
+        parsed = self.parse("-f", "-O2 -Wall", "main.c")
+        self.assertEqual(parsed.flags, "-O2 -Wall")
+        self.assertEqual(parsed.files, ["main.c"])
+
+    def test_separate_plain_flags(self):
+        self.assertEqual(self.parse("-f", "O2", "main.c").flags, "O2")
+
+    def test_parser_built_once(self):
+        from util.args import _build_parser
+        _build_parser.cache_clear()
+        self.parse("a.c")
+        self.parse("b.c")
+        self.assertEqual(_build_parser.cache_info().misses, 1)
@@ -1,6 +1,7 @@
 import unittest
 import os
 import shutil
+import tempfile
 import sys
 from pathlib import Path
 
@@ -11,10 +12,8 @@ from util.cache import CacheManager
 
 class TestCacheLifecycle(unittest.TestCase):
     def setUp(self):
-        self.test_dir = Path("test_cache_lifecycle_env")
-        if self.test_dir.exists():
-            shutil.rmtree(self.test_dir)
-        self.test_dir.mkdir(parents=True, exist_ok=True)
+        # Private temp dir, so concurrent test processes never share a working tree
+        self.test_dir = Path(tempfile.mkdtemp(prefix="test_cache_lifecycle_env_"))
         self.original_cwd = os.getcwd()
         os.chdir(self.test_dir)
         
@@ -38,15 +37,17 @@ class TestCacheLifecycle(unittest.TestCase):
         self.assertTrue(Path(".run_cache/objs").exists(), ".run_cache/objs should exist after get_object_path")
         self.assertTrue(Path(".run_cache").exists())
         
-        # 3. Update Cache: cache.json should be created
+        # 3. Update Cache: only in memory until flushed
         cache_mgr.update_cache(self.source_file)
-        self.assertTrue(Path(".run_cache/cache.json").exists(), "cache.json should exist after update_cache")
+        self.assertFalse(Path(".run_cache/cache.pkl").exists(), "update_cache should not write to disk")
+        cache_mgr.flush()
+        self.assertTrue(Path(".run_cache/cache.pkl").exists(), "cache.pkl should exist after flush")
 
     def test_cleanup(self):
         # Setup: Create cache structure
-        cache_mgr = CacheManager()
-        cache_mgr.update_cache(self.source_file)
-        self.assertTrue(Path(".run_cache/cache.json").exists())
+        with CacheManager() as cache_mgr:
+            cache_mgr.update_cache(self.source_file)
+        self.assertTrue(Path(".run_cache/cache.pkl").exists())
         
         # 1. Clear: Should remove everything
         cache_mgr.clear()
@@ -54,21 +55,21 @@ class TestCacheLifecycle(unittest.TestCase):
 
     def test_save_empty_cleanup(self):
         # Setup: Create cache structure
-        cache_mgr = CacheManager()
-        cache_mgr.update_cache(self.source_file)
-        self.assertTrue(Path(".run_cache/cache.json").exists())
+        with CacheManager() as cache_mgr:
+            cache_mgr.update_cache(self.source_file)
+        self.assertTrue(Path(".run_cache/cache.pkl").exists())
         
         # 1. Manually empty cache data and save
         cache_mgr.cache_data = {}
         cache_mgr._save_cache()
         
-        # Should remove cache.json. 
+        # Should remove cache.pkl. 
         # CAUTION: It might NOT remove .run_cache/objs if it still has content (which it might from other ops).
         # In this specific test, we didn't write to objs dir other than creating it.
         # But get_object_path IS NOT called here, so objs dir might not exist or be empty.
         
-        # To be sure, lets check cache.json is gone
-        self.assertFalse(Path(".run_cache/cache.json").exists(), "cache.json should be removed if empty")
+        # To be sure, lets check cache.pkl is gone
+        self.assertFalse(Path(".run_cache/cache.pkl").exists(), "cache.pkl should be removed if empty")
         
         # Since objs dir was created (if we followed previous logic? no, update_cache calls get_file_hash but not get_object_path)
         # Wait, update_cache does NOT ensure objs dir exists.
@@ -83,5 +84,103 @@ class TestCacheLifecycle(unittest.TestCase):
             # It's gone, which is what we want!
             self.assertFalse(Path(".run_cache").exists())
 
+    def test_file_hash_is_blake2b(self):
+        import hashlib
+        data = b"x" * ((1 << 20) * 2 + 123)
+        big = Path("big.c")
+        big.write_bytes(data)
+        self.assertEqual(CacheManager().get_file_hash(big), hashlib.blake2b(data, digest_size=16).digest())
+
+    def test_old_cache_format_is_ignored(self):
+        Path(".run_cache").mkdir()
+        import pickle
+        with open(".run_cache/cache.pkl", "wb") as f:
+            pickle.dump({str(self.source_file.absolute()): "d41d8cd98f00b204e9800998ecf8427e"}, f)
+        cache_mgr = CacheManager()
+        self.assertEqual(cache_mgr.cache_data, {})
+        self.assertTrue(cache_mgr.is_changed(self.source_file))
+
+    def test_exit_hook_only_while_dirty(self):
+        from unittest.mock import patch
+        from util import cache as cache_module
+        with patch.object(cache_module, "atexit") as mock_atexit:
+            cache_mgr = CacheManager()
+            self.assertTrue(cache_mgr.cache_dir.is_absolute())
+            mock_atexit.register.assert_not_called()
+
+            cache_mgr.update_cache(self.source_file)
+            cache_mgr.update_cache(self.source_file)
+            mock_atexit.register.assert_called_once_with(cache_mgr.flush)
+
+            cache_mgr.flush()
+            mock_atexit.unregister.assert_called_once_with(cache_mgr.flush)
+        cache_mgr.clear()
+
+    def test_corrupt_cache_is_ignored(self):
+        Path(".run_cache").mkdir()
+        # Unpickling this looks up a module that does not exist
+        Path(".run_cache/cache.pkl").write_bytes(b"cnosuchmod\nX\n.")
+        cache_mgr = CacheManager()
+        self.assertEqual(cache_mgr.cache_data, {})
+
+    def test_unchanged_stat_skips_hashing(self):
+        from unittest.mock import patch
+        cache_mgr = CacheManager()
+        cache_mgr.update_cache(self.source_file)
+
+        with patch.object(CacheManager, "get_file_hash") as mock_hash:
+            self.assertFalse(cache_mgr.is_changed(self.source_file))
+            mock_hash.assert_not_called()
+
+        # Touch without changing content: hashed once, then fast again
+        st = self.source_file.stat()
+        os.utime(self.source_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertFalse(cache_mgr.is_changed(self.source_file))
+        with patch.object(CacheManager, "get_file_hash") as mock_hash:
+            self.assertFalse(cache_mgr.is_changed(self.source_file))
+            mock_hash.assert_not_called()
+        cache_mgr.clear()
+
+    def test_batch_is_changed(self):
+        other = Path("other.c")
+        other.write_text("int x;")
+        cache_mgr = CacheManager()
+        cache_mgr.update_cache(self.source_file)
+        cache_mgr.update_cache(other)
+
+        # Same content with a new mtime, and a real edit
+        st = self.source_file.stat()
+        os.utime(self.source_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        other.write_text("int y = 1;")
+        new = Path("new.c")
+        new.write_text("")
+
+        result = cache_mgr.batch_is_changed([self.source_file, other, new])
+        self.assertEqual(result, {self.source_file: False, other: True, new: True})
+
+        # The rebuilt files reuse the digests hashed by the batch
+        from unittest.mock import patch
+        with patch.object(CacheManager, "get_file_hash") as mock_hash:
+            cache_mgr.update_cache(other)
+            cache_mgr.update_cache(new)
+            mock_hash.assert_not_called()
+        self.assertEqual(cache_mgr.batch_is_changed([other, new]), {other: False, new: False})
+
+        # Edited after the batch: hashed again
+        other.write_text("int y = 22;")
+        cache_mgr.batch_is_changed([other])
+        other.write_text("int y = 333;")
+        cache_mgr.update_cache(other)
+        self.assertEqual(cache_mgr.cache_data[str(other.absolute())][2], cache_mgr.get_file_hash(other))
+        cache_mgr.clear()
+
+    def test_object_path_is_stable(self):
+        import hashlib
+        cache_mgr = CacheManager()
+        obj_path = cache_mgr.get_object_path(self.source_file)
+        expected = hashlib.blake2b(str(self.source_file.absolute()).encode(), digest_size=8).hexdigest()
+        self.assertEqual(obj_path.name, f"{expected}_test.c.o")
+        self.assertIs(cache_mgr.get_object_path(self.source_file), obj_path)
+
 if __name__ == '__main__':
     unittest.main()
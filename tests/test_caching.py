@@ -1,6 +1,7 @@
 import unittest
 import os
 import shutil
+import tempfile
 import time
 from pathlib import Path
 import subprocess as spc
@@ -13,8 +14,8 @@ from runner import CompilerRunner
 
 class TestCaching(unittest.TestCase):
     def setUp(self):
-        self.test_dir = Path("test_caching_env")
-        self.test_dir.mkdir(parents=True, exist_ok=True)
+        # Private temp dir, so concurrent test processes never share a working tree
+        self.test_dir = Path(tempfile.mkdtemp(prefix="test_caching_env_"))
         self.original_cwd = os.getcwd()
         os.chdir(self.test_dir)
         
@@ -7,12 +7,13 @@ from pathlib import Path
 # Add src to sys.path so we can import modules as if we were in src/
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
-from src.util.config import Config
+from util.config import Config
 import tempfile
 
 class TestConfig(unittest.TestCase):
     def setUp(self):
-        self.config = Config()
+        # Reads the repository's Run.toml, so no config.pkl is written next to it
+        self.config = Config(use_cache=False)
 
     def test_default_config(self):
         # Assuming no Run.toml is present or it's just the default one
@@ -28,9 +29,66 @@ class TestConfig(unittest.TestCase):
         self.assertEqual(flags, [])
 
     @patch("builtins.open", new_callable=unittest.mock.mock_open, read_data=b'runner = "invalid_type"')
-    @patch("src.util.config.tomllib.load")
+    @patch("tomllib.load")
     def test_invalid_config(self, mock_toml_load, mock_file):
         mock_toml_load.return_value = {"runner": "invalid_type"}
         # Expect ValueError during init
         with self.assertRaises(ValueError):
-             Config()
+             Config(use_cache=False)
+
+    def test_parsed_config_is_cached(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                Path("Run.toml").write_text('[runner]\nc = "clang"\n')
+                self.assertEqual(Config().get_runner("c", "gcc"), "clang")
+                self.assertTrue(Path(".run_cache/config.pkl").exists())
+
+                # Cache hit: tomllib is not used at all
+                with patch("tomllib.load", side_effect=AssertionError("parsed again")):
+                    self.assertEqual(Config().get_runner("c", "gcc"), "clang")
+
+                # Edited Run.toml invalidates the cache
+                Path("Run.toml").write_text('[runner]\nc = "tcc"\n')
+                self.assertEqual(Config().get_runner("c", "gcc"), "tcc")
+
+                # Disabled cache always parses
+                with patch("tomllib.load", return_value={}) as mock_load:
+                    Config(use_cache=False)
+                    mock_load.assert_called_once()
+            finally:
+                os.chdir(cwd)
+
+    def test_get_language_by_extension(self):
+        self.config.data = {"language": {
+            "zenc": {"extensions": [".zc"], "runner": "zc"},
+            "other": {"extensions": [".zc", ".ot"], "runner": "ot"},
+        }}
+        self.config._invalidate_lookups()
+        self.assertEqual(self.config.get_language_by_extension(".zc")["name"], "zenc")
+        self.assertEqual(self.config.get_language_by_extension(".ot")["runner"], "ot")
+        self.assertIsNone(self.config.get_language_by_extension(".c"))
+        self.assertTrue(self.config.is_custom_language_configured(".ot"))
+        self.assertFalse(self.config.is_custom_language_configured(".c"))
+
+    def test_find_workspace_config_walks_up(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            deep = Path(tmp) / "a" / "b" / "c"
+            deep.mkdir(parents=True)
+            (Path(tmp) / "a" / "Run.toml").write_text("")
+            self.assertEqual(self.config._find_workspace_config(str(deep)), Path(tmp) / "a" / "Run.toml")
+            # Only 4 levels (current + 3 parents) are searched
+            self.assertIsNone(self.config._find_workspace_config(str(deep / "d" / "e")))
+
+    def test_preset_flags_from_string(self):
+        self.config.data = {"preset": {"dbg": {
+            "c": "-g  -Wall",
+            "cpp": "-DNAME='a b' -O2",
+            "rust": ["-C", "opt-level=3"],
+        }}}
+        self.config._invalidate_lookups()
+        self.assertEqual(self.config.get_preset_flags("dbg", "c"), ["-g", "-Wall"])
+        self.assertEqual(self.config.get_preset_flags("dbg", "cpp"), ["-DNAME=a b", "-O2"])
+        self.assertEqual(self.config.get_preset_flags("dbg", "rust"), ["-C", "opt-level=3"])
+        self.assertEqual(self.config.get_preset_flags("dbg", "java"), [])
@@ -1,33 +1,51 @@
 import unittest
 from pathlib import Path
 import os
+import shutil
 import sys
+import tempfile
 
 # Add src to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+# And the tests dir itself for _helpers, whatever the cwd or entry point
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from src.runner.core import CompilerRunner
-from src.util.output import Printer
-import tempfile
-import shutil
-import tempfile
-import shutil
+from runner.core import CompilerRunner
+from util.output import Printer
+from _helpers import TMPDIR, gcc_path
+
+HELLO_PY = b"print('Hello Integration')\n"
+HELLO_C = b'#include <stdio.h>\nint main() { printf("Hello C"); return 0; }\n'
 
 class TestIntegration(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # One directory for the whole class, the canonical sources are written once
+        cls.shared_dir = Path(tempfile.mkdtemp(dir=TMPDIR))
+        cls.sources = cls.shared_dir / "sources"
+        cls.sources.mkdir()
+        (cls.sources / "hello.py").write_bytes(HELLO_PY)
+        (cls.sources / "test.c").write_bytes(HELLO_C)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.shared_dir)
+
     def setUp(self):
-        self.runner = CompilerRunner(op_flags={"dry_run": False, "time": False, "keep": False})
-        self.test_dir = tempfile.mkdtemp()
+        self.test_dir = self.shared_dir / self._testMethodName
+        self.test_dir.mkdir()
         self.cwd = os.getcwd()
         os.chdir(self.test_dir)
+        # Built after the chdir, so config and build caches land in the temp dir
+        self.runner = CompilerRunner(op_flags={"dry_run": False, "time": False, "keep": False})
 
     def tearDown(self):
+        # The per-test dir is left in place, tearDownClass removes the whole tree at once
         os.chdir(self.cwd)
-        shutil.rmtree(self.test_dir)
 
     def test_run_python_script(self):
         script_name = "hello.py"
-        with open(script_name, "w") as f:
-            f.write("print('Hello Integration')")
+        shutil.copy(self.sources / script_name, script_name)
         
         # We can't easily capture output here without redirecting stdout/stderr at system level
         # For now, just ensure it runs without error
@@ -36,15 +54,10 @@ class TestIntegration(unittest.TestCase):
         except Exception as e:
             self.fail(f"Integration run failed: {e}")
 
+    @unittest.skipUnless(gcc_path(), "gcc not found")
     def test_compile_run_c(self):
-        # Skip if no gcc
-        import shutil
-        if not shutil.which("gcc"):
-            self.skipTest("gcc not found")
-
         source_name = "test.c"
-        with open(source_name, "w") as f:
-            f.write('#include <stdio.h>\nint main() { printf("Hello C"); return 0; }')
+        shutil.copy(self.sources / source_name, source_name)
         
         try:
             self.runner.compile_and_run([source_name])
@@ -1,35 +1,75 @@
 import unittest
+from unittest.mock import patch
+import atexit
+import hashlib
 import os
+import shlex
 import shutil
 import sys
+import tempfile
 from pathlib import Path
 import subprocess as spc
 
 # Add src to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+# And the tests dir itself for _helpers, whatever the cwd or entry point
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+import main as cli
+from util.security import SecurityManager
+from _helpers import TMPDIR, gcc_path
+
+# Finished test dirs are renamed in here and removed once, when the process exits
+_TRASH = Path(tempfile.mkdtemp(prefix="test_nocache_trash_", dir=TMPDIR))
+atexit.register(shutil.rmtree, _TRASH, ignore_errors=True)
+
+FAKE_CC = Path(__file__).resolve().parent / "fake_cc.py"
+
+@unittest.skipUnless(os.name == "posix", "the fake compiler writes shell scripts")
 class TestNoCacheFlag(unittest.TestCase):
     def setUp(self):
-        self.test_dir = Path("test_nocache_env")
-        if self.test_dir.exists():
-            shutil.rmtree(self.test_dir)
-        self.test_dir.mkdir(parents=True, exist_ok=True)
+        # Private temp dir, so concurrent test processes never share a working tree
+        self.test_dir = Path(tempfile.mkdtemp(prefix="test_nocache_env_", dir=TMPDIR))
         self.original_cwd = os.getcwd()
         os.chdir(self.test_dir)
         
         # Create a dummy source file
         self.source_file = Path("main.c")
-        self.source_file.write_text('#include <stdio.h>\nint main() { printf("Hello"); return 0; }')
+        self.source_file.write_bytes(b'#include <stdio.h>\nint main() { printf("Hello"); return 0; }')
 
-        # Path to main.py
-        self.run_script = Path(self.original_cwd) / "src/main.py"
-        self.python_exec = sys.executable
+        # Only cache side effects matter here, so a fake compiler stands in for gcc
+        fake_cc = self.test_dir / "cc"
+        fake_cc.write_text(f'#!/bin/sh\nexec {shlex.quote(sys.executable)} {shlex.quote(str(FAKE_CC))} "$@"\n')
+        fake_cc.chmod(0o755)
+        Path("Run.toml").write_text(f'[runner]\nc = "{fake_cc}"\n')
 
     def tearDown(self):
         os.chdir(self.original_cwd)
-        # Cleanup
-        if self.test_dir.exists():
-            shutil.rmtree(self.test_dir)
+        # Cleanup: a rename is one syscall, the tree itself is deleted at exit
+        try:
+            self.test_dir.rename(_TRASH / self.test_dir.name)
+        except OSError:
+            shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def run_cli(self, *argv):
+        """
+        Run main.main in-process and return (exit_code, stdout).
+        stdout is captured at the fd level, so the compiled program's output is included.
+        """
+        with tempfile.TemporaryFile() as out:
+            sys.stdout.flush()
+            saved = os.dup(1)
+            os.dup2(out.fileno(), 1)
+            try:
+                # The root check has its own tests, the suite may run as root in containers
+                with patch.object(SecurityManager, "check_root"):
+                    code = cli.main(list(argv))
+            finally:
+                sys.stdout.flush()
+                os.dup2(saved, 1)
+                os.close(saved)
+            out.seek(0)
+            return code, out.read().decode()
 
     def test_no_cache_flag_prevents_cache_creation(self):
         # Ensure no cache exists initially
@@ -37,11 +77,10 @@ class TestNoCacheFlag(unittest.TestCase):
         self.assertFalse(cache_dir.exists())
         
         # Run with --no-cache
-        cmd = [self.python_exec, str(self.run_script), str(self.source_file), "--no-cache"]
-        res = spc.run(cmd, capture_output=True, text=True)
+        code, out = self.run_cli(str(self.source_file), "--no-cache")
         
-        self.assertEqual(res.returncode, 0, f"Run failed: {res.stderr}")
-        self.assertIn("Hello", res.stdout)
+        self.assertEqual(code, 0, f"Run failed: {out}")
+        self.assertIn("Hello", out)
         
         # Assert .run_cache was NOT created
         self.assertFalse(cache_dir.exists(), ".run_cache should not exist after running with --no-cache")
@@ -51,41 +90,35 @@ class TestNoCacheFlag(unittest.TestCase):
         self.assertFalse(obj.exists(), "Local object file should be cleaned up")
 
     def test_no_cache_ignores_existing_cache(self):
-        # 1. Run normally to populate cache
-        cmd = [self.python_exec, str(self.run_script), str(self.source_file)]
-        res = spc.run(cmd, capture_output=True, text=True)
-        
-        if res.returncode != 0:
-            print("Run 1 failed:", res.stderr)
+        # 1. Run normally to populate cache (object caching is used by multi-file builds)
+        code, out = self.run_cli(str(self.source_file), "-m")
         
         cache_dir = Path(".run_cache")
-        if not cache_dir.exists():
-            print("Run 1 Output:\n", res.stdout)
-            print("Run 1 Error:\n", res.stderr)
+        if code != 0 or not cache_dir.exists():
+            print("Run 1 Output:\n", out)
             
         self.assertTrue(cache_dir.exists())
         
-        # Get mtime of object file in cache
+        # Hash the cached object's content, a rewrite from the modified source would change it
         objs = list(cache_dir.glob("objs/*.o"))
         self.assertTrue(len(objs) > 0)
-        old_mtime = objs[0].stat().st_mtime
+        old_digest = hashlib.blake2b(objs[0].read_bytes(), digest_size=16).digest()
         
-        # 2. Modify source
-        import time
-        time.sleep(1.1)
-        self.source_file.write_text('#include <stdio.h>\nint main() { printf("Hello Modified"); return 0; }')
+        # 2. Modify source, moving its mtime forward instead of waiting for a clock tick
+        src_mtime = self.source_file.stat().st_mtime
+        self.source_file.write_bytes(b'#include <stdio.h>\nint main() { printf("Hello Modified"); return 0; }')
+        os.utime(self.source_file, (src_mtime + 2, src_mtime + 2))
         
         # 3. Run with --no-cache
-        cmd = [self.python_exec, str(self.run_script), str(self.source_file), "--no-cache"]
-        res = spc.run(cmd, capture_output=True, text=True)
-        self.assertIn("Hello Modified", res.stdout)
+        code, out = self.run_cli(str(self.source_file), "-m", "--no-cache")
+        self.assertIn("Hello Modified", out)
         
         # Assert cache object NOT updated (or at least we didn't use it)
         # Actually, since we bypass cache, the cache dir might remain stale. 
         # But crucially, we verified "Hello Modified" ran, so it definitely recompiled.
         # And since we didn't update cache, the object in cache should match OLD source?
         # Unless we inadvertently updated it? The logic says if cache=None, we don't call update_cache.
-        # So check mtime of cached object should be same as before?
+        # So the cached object's content should be the same as before?
         
         new_objs = list(cache_dir.glob("objs/*.o"))
         if new_objs: # It's possible cache key changed if path hash changed? No, path is same.
@@ -93,7 +126,25 @@ class TestNoCacheFlag(unittest.TestCase):
             # c_family_handler: if cache matches, return. If not, compile.
             # But with --no-cache, cache is None. So we compile to LOCAL .o file.
             # The cached .o file in .run_cache/objs should be UNTOUCHED.
-            self.assertEqual(new_objs[0].stat().st_mtime, old_mtime, "Cached object should not be modified by --no-cache run")
+            new_digest = hashlib.blake2b(new_objs[0].read_bytes(), digest_size=16).digest()
+            self.assertEqual(new_digest, old_digest, "Cached object should not be modified by --no-cache run")
+
+
+@unittest.skipUnless(gcc_path(), "gcc not found")
+@unittest.skipUnless(os.environ.get("RUN_SLOW_TESTS"), "set RUN_SLOW_TESTS=1 to run the CLI smoke test")
+class TestNoCacheFlagCLI(unittest.TestCase):
+    """End-to-end check through a real interpreter, kept out of the default run."""
+
+    def test_cli_no_cache(self):
+        run_script = Path(__file__).resolve().parent.parent / "src" / "main.py"
+        with tempfile.TemporaryDirectory(dir=TMPDIR) as tmp:
+            source = Path(tmp) / "main.c"
+            source.write_bytes(b'#include <stdio.h>\nint main() { printf("Hello"); return 0; }')
+            res = spc.run([sys.executable, str(run_script), "main.c", "--no-cache", "--unsafe"],
+                          cwd=tmp, capture_output=True, text=True)
+            self.assertEqual(res.returncode, 0, res.stderr)
+            self.assertIn("Hello", res.stdout)
+            self.assertFalse((Path(tmp) / ".run_cache").exists())
 
 if __name__ == '__main__':
     unittest.main()
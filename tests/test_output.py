@@ -0,0 +1,51 @@
+import unittest
+from unittest.mock import patch
+import io
+import subprocess
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from util import output
+from util.output import Printer, Colors
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+
+class TestPrinter(unittest.TestCase):
+    def capture(self, func, *args):
+        buf = io.StringIO()
+        with patch.object(sys, "stdout", buf):
+            func(*args)
+        return buf.getvalue()
+
+    def test_plain_when_not_tty(self):
+        with patch.object(output, "_USE_COLOR", False):
+            self.assertEqual(self.capture(Printer.action, "RUN", "./a.out"), "[ RUN ] ./a.out\n")
+
+    def test_colored_on_tty(self):
+        with patch.object(output, "_USE_COLOR", True):
+            out = self.capture(Printer.info, "hello")
+        self.assertEqual(out, f"{Colors.BOLD}{Colors.CYAN}[ INFO ]{Colors.RESET} hello\n")
+
+    def test_debug_silent_until_enabled(self):
+        buf = io.StringIO()
+        with patch.object(output.handler, "stream", buf), \
+             patch.object(output, "_DEBUG_ENABLED", False):
+            Printer.debug("hidden")
+        self.assertEqual(buf.getvalue(), "")
+
+    def test_order_kept_when_piped(self):
+        # A child process writes to the same fd; block buffering would push the tags after it
+        script = (
+            "import os, sys\n"
+            f"sys.path.insert(0, {SRC_DIR!r})\n"
+            "from util.output import Printer\n"
+            "Printer.action('RUN', 'child')\n"
+            "os.write(1, b'child output\\n')\n"
+            "Printer.warning('done')\n"
+        )
+        env = {k: v for k, v in os.environ.items() if k != "PYTHONUNBUFFERED"}
+        res = subprocess.run([sys.executable, "-c", script], stdout=subprocess.PIPE, env=env, check=True)
+        self.assertEqual(res.stdout.decode().splitlines(),
+                         ["[ RUN ] child", "child output", "[ WARN ] done"])
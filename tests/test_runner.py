@@ -1,5 +1,9 @@
 import unittest
-from unittest.mock import MagicMock, patch
+import copy
+import io
+from unittest.mock import patch
+from concurrent.futures import Future
+from dataclasses import dataclass, field
 from pathlib import Path
 import sys
 import os
@@ -10,100 +14,180 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../s
 from runner.core import CompilerRunner
 from util.errors import ExecutionError, CompilationError
 
+# Shared source paths, Path is immutable so one instance serves every test
+_TEST_C = Path("test.c")
+_MAIN_C = Path("main.c")
+_LIB_C = Path("lib.c")
+
+@dataclass
+class _FakeCompletedProcess:
+    returncode: int = 0
+    stdout: bytes = b""
+    stderr: bytes = b""
+
+@dataclass
+class _FakeRun:
+    """Stands in for subprocess.run: records each command and returns a fixed result."""
+    returncode: int = 0
+    calls: list = field(default_factory=list)
+
+    def __call__(self, cmd, *args, **kwargs):
+        self.calls.append(cmd)
+        return _FakeCompletedProcess(self.returncode)
+
+class _InlineExecutor:
+    """Stands in for ThreadPoolExecutor: runs each task on submit and returns a finished Future."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
 class TestCompilerRunner(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Built once, so Run.toml is loaded once for the whole class.
+        # no_cache: the cwd is the checkout, neither config.pkl nor .run_cache/objs belong there
+        cls._base = CompilerRunner(op_flags={"dry_run": True, "time": False, "keep": False, "no_cache": True})
+
     def setUp(self):
-        self.runner = CompilerRunner(op_flags={"dry_run": True, "time": False, "keep": False})
+        # Shallow copy: scalars are per test, mutable containers are replaced
+        self.runner = copy.copy(self._base)
+        self.runner.output_files = []
+        self.runner.extra_flags = []
+        self.runner.java_precompiled = set()
 
     def test_get_executable_path_posix(self):
         self.runner.is_posix = True
-        path = Path("test.c")
+        path = _TEST_C
         exec_path = self.runner.get_executable_path(path)
         # Path("./test.out") normalizes to "test.out"
         self.assertEqual(str(exec_path), "test.out")
 
     def test_get_executable_path_windows(self):
         self.runner.is_posix = False
-        path = Path("test.c")
+        path = _TEST_C
         exec_path = self.runner.get_executable_path(path)
         self.assertEqual(str(exec_path), "test.exe")
 
-    @patch("subprocess.run")
-    def test_run_command_dry_run(self, mock_run):
+    @patch("subprocess.run", new_callable=_FakeRun)
+    def test_run_command_dry_run(self, fake_run):
         # Should not call subprocess.run because dry_run is True
         result = self.runner.run_command(["echo", "hello"])
         self.assertTrue(result)
-        mock_run.assert_not_called()
+        self.assertEqual(fake_run.calls, [])
 
-    @patch("subprocess.run")
-    def test_run_command_real(self, mock_run):
+    @patch("subprocess.run", new_callable=_FakeRun)
+    def test_run_command_real(self, fake_run):
         self.runner.dry_run = False
-        mock_run.return_value.returncode = 0
         
         result = self.runner.run_command(["echo", "hello"])
         self.assertTrue(result)
-        mock_run.assert_called_once()
+        self.assertEqual(fake_run.calls, [["echo", "hello"]])
 
-    @patch("subprocess.run")
-    def test_run_command_failure(self, mock_run):
+    @patch("subprocess.run", new_callable=lambda: _FakeRun(returncode=1))
+    def test_run_command_failure(self, fake_run):
         self.runner.dry_run = False
-        mock_run.return_value.returncode = 1
         
         with self.assertRaises(ExecutionError):
             self.runner.run_command(["false"])
 
-    @patch("builtins.open")
-    @patch("pathlib.Path.is_file")
-    def test_detect_language_shebang(self, mock_is_file, mock_open):
-        mock_is_file.return_value = True
-        
-        # Mock file content
-        mock_file = MagicMock()
-        mock_file.__enter__.return_value = mock_file
-        mock_file.readline.return_value = "#!/usr/bin/env python3"
-        mock_open.return_value = mock_file
-        
+    # StringIO is its own context manager, so it stands in for the opened file directly
+    @patch("builtins.open", lambda *args, **kwargs: io.StringIO("#!/usr/bin/env python3\n"))
+    @patch("pathlib.Path.is_file", return_value=True)
+    def test_detect_language_shebang(self, mock_is_file):
         path = Path("script_no_ext")
         # Ensure suffix is empty
         # Mocking run_command to verify it detects python
-        with patch.object(self.runner, 'run_command') as mock_run_cmd:
+        with patch.object(CompilerRunner, 'run_command') as mock_run_cmd:
              # run_command will be called with python explicitly
              # _get_python_executable is called
-             with patch.object(self.runner, '_get_python_executable', return_value="python"):
+             with patch.object(CompilerRunner, '_get_python_executable', return_value="python"):
                  self.runner._handle_single_file(path)
                  mock_run_cmd.assert_called_with(["python", "script_no_ext"])
 
-    @patch("subprocess.run")
-    def test_multi_compile_c_link_flags(self, mock_run):
+    @patch("subprocess.run", new_callable=_FakeRun)
+    def test_multi_compile_c_link_flags(self, fake_run):
         # Test specifically focusing on _handle_multi_c_family
         self.runner.preset = "build"
         self.runner.extra_flags = []
         self.runner.dry_run = False # Ensure subprocess.run is called
-        mock_run.return_value.returncode = 0
-        
-        # Mock config
-        self.runner.config.get_preset_flags = MagicMock(return_value=["-LinkFlag"])
-        self.runner.config.get_runner = MagicMock(return_value="gcc")
         
+        # Mock config (patched, not assigned: the Config object is shared by the class fixture)
         # Mock compiled object return
-        # We patch the class method because it might be picked up differently in threads
-        # But patching instance is cleaner
-        with patch.object(self.runner, "_compile_object_file", return_value=Path("test.o")):
-             # Mock get_executable_path
-             self.runner.get_executable_path = MagicMock(return_value=Path("out.exe"))
-             self.runner._execute_binary = MagicMock()
+        # CompilerRunner uses __slots__, so methods are patched on the class
+        with patch.object(self.runner.config, "get_preset_flags", return_value=["-LinkFlag"]), \
+             patch.object(self.runner.config, "get_runner", return_value="gcc"), \
+             patch.object(CompilerRunner, "_compile_object_file", return_value=Path("test.o")), \
+             patch.object(CompilerRunner, "get_executable_path", return_value=Path("out.exe")), \
+             patch.object(CompilerRunner, "_execute_binary"), \
+             patch("concurrent.futures.ThreadPoolExecutor", _InlineExecutor):
+             sources = [_MAIN_C, _LIB_C]
              
-             sources = [Path("main.c"), Path("lib.c")]
-             
-             # We rely on real ThreadPoolExecutor here, assuming mock is thread-safe for reading return_value
+             # Compiles run inline on submit, no worker threads are started
              self.runner._handle_multi_c_family(sources, sources)
              
              # Check calls to run_command
              # The last call should be the link command
              # Expected: gcc test.o test.o -o out.exe -LinkFlag
              
-             if not mock_run.call_args_list:
+             if not fake_run.calls:
                  self.fail("subprocess.run was not called")
                  
-             link_call = mock_run.call_args_list[-1]
-             args = link_call[0][0]
+             args = frozenset(fake_run.calls[-1])
              self.assertIn("-LinkFlag", args, "Preset flags missing from link command")
+             self.assertLessEqual({"test.o", "-o", "out.exe"}, args)
+
+    def test_java_files_compiled_in_one_batch(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            sources = []
+            for name in ("First", "Second"):
+                src = Path(tmp) / f"{name}.java"
+                src.write_text(f"public class {name} {{ public static void main(String[] a) {{ }} }}")
+                sources.append(str(src))
+
+            with patch.object(CompilerRunner, "run_command") as mock_run_cmd:
+                self.runner.compile_and_run(sources)
+
+            cmds = [c[0][0] for c in mock_run_cmd.call_args_list]
+            compile_cmds = [c for c in cmds if c[0] == "javac"]
+            self.assertEqual(len(compile_cmds), 1, "Java files should share one javac call")
+            self.assertEqual(compile_cmds[0][-2:], sources)
+            self.assertEqual([c for c in cmds if c[0] == "java"], [["java", "First"], ["java", "Second"]])
+
+    def test_runner_has_no_instance_dict(self):
+        self.assertFalse(hasattr(self.runner, "__dict__"))
+
+    def test_find_source_files_max_depth(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "sub" / "deep").mkdir(parents=True)
+            for rel in ("top.c", "sub/mid.c", "sub/deep/low.c"):
+                (root / rel).write_text("")
+
+            found = lambda depth: sorted(Path(f).name for f in self.runner.find_source_files(root, max_depth=depth))
+            self.assertEqual(found(0), ["top.c"])
+            self.assertEqual(found(1), ["mid.c", "top.c"])
+            self.assertEqual(found(None), ["low.c", "mid.c", "top.c"])
+
+    @patch("subprocess.run", new_callable=_FakeRun)
+    def test_lua_lookup_does_not_spawn_shell(self, fake_run):
+        with patch("runner.script_handler.which", return_value=None), \
+             patch.object(CompilerRunner, "run_command") as mock_run_cmd:
+            self.runner._handle_lua_execution(Path("script.lua"))
+        self.assertEqual(fake_run.calls, [])
+        mock_run_cmd.assert_called_with(["luajit", "script.lua"])
@@ -30,7 +30,11 @@ class TestSecurityManager(unittest.TestCase):
         SecurityManager.check_root(allow_root=False)
 
     def test_sanitize_env(self):
-        with patch.dict(os.environ, {"LD_PRELOAD": "/evil.so", "PATH": "/bin"}):
+        env = SecurityManager.sanitize_execution_env({"LD_PRELOAD": "/evil.so", "PATH": "/bin"})
+        self.assertEqual(env, {"PATH": "/bin"})
+
+    def test_sanitize_env_cached(self):
+        with patch.object(SecurityManager, "_cached_env", None):
             env = SecurityManager.sanitize_execution_env()
             self.assertNotIn("LD_PRELOAD", env)
-            self.assertIn("PATH", env)
+            self.assertIs(SecurityManager.sanitize_execution_env(), env)
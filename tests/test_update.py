@@ -0,0 +1,342 @@
+import unittest
+import sys
+import os
+import shutil
+import subprocess
+import tempfile
+import zipfile
+import time
+import hashlib
+import importlib.util
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from util import update
+
+class TestExtractZip(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def make_zip(self, entries):
+        zip_path = self.tmp / "release.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            for name, data, mode in entries:
+                info = zipfile.ZipInfo(name)
+                info.external_attr = mode << 16
+                zf.writestr(info, data)
+        return zip_path
+
+    def test_strips_github_prefix(self):
+        zip_path = self.make_zip([
+            ("run-1.0/", "", 0o755),
+            ("run-1.0/setup.sh", "echo hi", 0o755),
+            ("run-1.0/src/main.py", "print()", 0o644),
+        ])
+        out = update._extract_zip(zip_path, self.tmp / "extracted")
+        self.assertEqual(out, self.tmp / "extracted")
+        self.assertEqual((out / "src" / "main.py").read_text(), "print()")
+        if os.name == "posix":
+            self.assertTrue(os.access(out / "setup.sh", os.X_OK))
+
+    def test_without_common_prefix(self):
+        zip_path = self.make_zip([("a.txt", "a", 0o644), ("b/c.txt", "c", 0o644)])
+        out = update._extract_zip(zip_path, self.tmp / "extracted")
+        self.assertEqual((out / "a.txt").read_text(), "a")
+        self.assertEqual((out / "b" / "c.txt").read_text(), "c")
+
+    def test_skips_path_traversal(self):
+        zip_path = self.make_zip([("../evil.txt", "x", 0o644), ("ok.txt", "ok", 0o644)])
+        out = update._extract_zip(zip_path, self.tmp / "extracted")
+        self.assertFalse((self.tmp / "evil.txt").exists())
+        self.assertTrue((out / "ok.txt").exists())
+
+
+class TestConditionalFetch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.cache_patch = patch.object(update, "_etag_cache_file", return_value=self.tmp / "etag.json")
+        self.cache_patch.start()
+
+    def tearDown(self):
+        self.cache_patch.stop()
+        shutil.rmtree(self.tmp)
+
+    def response(self, status, text="", headers=None):
+        return MagicMock(status_code=status, text=text, headers=headers or {})
+
+    def test_not_modified_uses_cached_content(self):
+        body = '[project]\nversion = "1.2.3"\n'
+        session = MagicMock()
+        session.get.return_value = self.response(200, body, {"ETag": '"abc"'})
+        with patch.object(update, "_get_session", return_value=session):
+            self.assertEqual(update._get_remote_pyproject_data("o/r"), ("1.2.3", body))
+
+            session.get.return_value = self.response(304)
+            self.assertEqual(update._get_remote_pyproject_data("o/r"), ("1.2.3", body))
+
+        headers = session.get.call_args.kwargs["headers"]
+        self.assertEqual(headers, {"If-None-Match": '"abc"'})
+
+    def test_no_private_cache_dir_means_unconditional(self):
+        body = '[project]\nversion = "1.2.3"\n'
+        session = MagicMock()
+        session.get.return_value = self.response(200, body, {"ETag": '"abc"'})
+        with patch.object(update, "_get_session", return_value=session), \
+             patch.object(update, "_archive_cache_dir", return_value=None):
+            self.cache_patch.stop()
+            try:
+                update._get_remote_pyproject_data("o/r")
+                update._get_remote_pyproject_data("o/r")
+            finally:
+                self.cache_patch.start()
+
+        self.assertEqual(session.get.call_args.kwargs["headers"], {})
+        self.assertFalse((self.tmp / "etag.json").exists())
+
+    def test_expected_digest_picks_archive_line(self):
+        session = MagicMock()
+        session.get.return_value = self.response(200, "AA  v1.0.zip\nbb  v1.1.zip\n")
+        with patch.object(update, "_get_session", return_value=session):
+            self.assertEqual(update._get_expected_digest("o/r", "v1.0.zip"), "aa")
+            self.assertIsNone(update._get_expected_digest("o/r", "v2.0.zip"))
+
+    def test_expected_digest_single_line(self):
+        session = MagicMock()
+        with patch.object(update, "_get_session", return_value=session):
+            session.get.return_value = self.response(200, "AA\n")
+            self.assertEqual(update._get_expected_digest("o/r", "v1.0.zip"), "aa")
+            # A lone line naming another archive is not a digest for this one
+            session.get.return_value = self.response(200, "aa  run-1.2.zip\n")
+            self.assertIsNone(update._get_expected_digest("o/r", "v1.3.zip"))
+
+
+@unittest.skipUnless(hasattr(os, "getuid"), "ownership check is POSIX only")
+class TestArchiveCacheDir(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.env_patch = patch.dict(os.environ, {"XDG_CACHE_HOME": str(self.tmp)})
+        self.env_patch.start()
+
+    def tearDown(self):
+        self.env_patch.stop()
+        shutil.rmtree(self.tmp)
+
+    def test_created_private(self):
+        cache_dir = update._archive_cache_dir()
+        self.assertEqual(cache_dir, self.tmp / "run" / "updates")
+        self.assertEqual(cache_dir.stat().st_mode & 0o777, 0o700)
+
+    def test_loose_permissions_tightened(self):
+        (self.tmp / "run" / "updates").mkdir(parents=True, mode=0o777)
+        os.chmod(self.tmp / "run" / "updates", 0o777)
+        self.assertEqual(update._archive_cache_dir().stat().st_mode & 0o777, 0o700)
+
+    def test_foreign_owner_rejected(self):
+        with patch.object(update.os, "getuid", return_value=os.getuid() + 1):
+            self.assertIsNone(update._archive_cache_dir())
+            self.assertIsNone(update._etag_cache_file())
+
+    def test_etag_cache_is_private(self):
+        self.assertEqual(update._etag_cache_file(), self.tmp / "run" / "updates" / "etag.json")
+
+
+@unittest.skipUnless(importlib.util.find_spec("requests"), "requests not installed")
+class TestResumableDownload(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_retry_resumes_with_range(self):
+        import requests
+        data = b"a" * 10 + b"b" * 10
+
+        def broken_stream(**kwargs):
+            yield data[:10]
+            raise requests.ConnectionError("reset")
+
+        first = MagicMock(status_code=200)
+        first.__enter__.return_value = first
+        first.iter_content.side_effect = broken_stream
+        second = MagicMock(status_code=206)
+        second.__enter__.return_value = second
+        second.iter_content.return_value = [data[10:]]
+
+        session = MagicMock()
+        session.get.side_effect = [first, second]
+        dest = self.tmp / "release.zip"
+        with patch.object(update, "_get_session", return_value=session), \
+             patch.object(update.time, "sleep"):
+            digest = update._download_file("https://example.invalid/a.zip", dest)
+
+        self.assertEqual(dest.read_bytes(), data)
+        self.assertEqual(digest, hashlib.sha256(data).hexdigest())
+        self.assertEqual(session.get.call_args.kwargs["headers"], {"Range": "bytes=10-"})
+
+
+@unittest.skipUnless(importlib.util.find_spec("requests"), "requests not installed")
+class TestUpdateArchiveCache(unittest.TestCase):
+    DATA = b"zipdata"
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.cache = self.tmp / "run" / "updates"
+        self.env_patch = patch.dict(os.environ, {"XDG_CACHE_HOME": str(self.tmp)})
+        self.env_patch.start()
+
+    def tearDown(self):
+        self.env_patch.stop()
+        shutil.rmtree(self.tmp)
+
+    def run_update(self, expected_digest, head_headers):
+        """Run update() up to the updater spawn, return the paths _download_file was given."""
+        session = MagicMock()
+        session.head.return_value = MagicMock(status_code=200, headers=head_headers)
+        downloads = []
+
+        def download(url, dest):
+            downloads.append((dest, dest.exists()))
+            dest.write_bytes(self.DATA)
+            return hashlib.sha256(self.DATA).hexdigest()
+
+        temp_dirs = []
+        real_mkdtemp = tempfile.mkdtemp
+
+        def mkdtemp(**kwargs):
+            temp_dirs.append(real_mkdtemp(dir=self.tmp, **kwargs))
+            return temp_dirs[-1]
+
+        with patch.object(update, "_get_remote_pyproject_data", return_value=("2.0", "")), \
+             patch.object(update, "_get_session", return_value=session), \
+             patch.object(update, "_get_expected_digest", return_value=expected_digest), \
+             patch.object(update, "_download_file", side_effect=download), \
+             patch.object(update, "_extract_zip", return_value=self.tmp / "extracted"), \
+             patch.object(update, "_spawn_detached"), \
+             patch.object(update.subprocess, "Popen"), \
+             patch.object(tempfile, "mkdtemp", side_effect=mkdtemp), \
+             patch("builtins.input", return_value="y"), \
+             patch.object(update.Printer, "action"), patch.object(update.Printer, "info"):
+            with self.assertRaises(SystemExit):
+                update.update("o/r", "1.0")
+        return downloads
+
+    def test_verified_archive_is_reused(self):
+        digest = hashlib.sha256(self.DATA).hexdigest()
+        self.assertEqual(len(self.run_update(digest, {"Content-Length": str(len(self.DATA))})), 1)
+        self.assertEqual(self.run_update(digest, {"Content-Length": str(len(self.DATA))}), [])
+
+    def test_stale_archive_without_length_is_not_resumed(self):
+        self.cache.mkdir(parents=True)
+        (self.cache / "2.0.zip").write_bytes(b"stale!!")
+        downloads = self.run_update(hashlib.sha256(self.DATA).hexdigest(), {})
+        self.assertEqual(downloads, [(self.cache / "2.0.zip", False)])
+
+    def test_unverifiable_archive_is_not_cached(self):
+        self.cache.mkdir(parents=True)
+        (self.cache / "2.0.zip").write_bytes(self.DATA)
+        downloads = self.run_update(None, {"Content-Length": str(len(self.DATA))})
+        self.assertEqual(len(downloads), 1)
+        self.assertNotIn(self.cache, downloads[0][0].parents)
+        self.assertEqual(list(self.cache.glob("*.zip")), [])
+
+
+class TestDownloadAttempt(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_range_not_satisfiable_means_complete(self):
+        dest = self.tmp / "release.zip"
+        dest.write_bytes(b"complete")
+        response = MagicMock(status_code=416)
+        response.__enter__.return_value = response
+        session = MagicMock()
+        session.get.return_value = response
+        with patch.object(update, "_get_session", return_value=session):
+            digest = update._download_attempt("https://example.invalid/a.zip", dest)
+
+        self.assertEqual(digest, hashlib.sha256(b"complete").hexdigest())
+        self.assertEqual(dest.read_bytes(), b"complete")
+        response.raise_for_status.assert_not_called()
+
+
+class TestUpdaterPayload(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_installs_release_and_cleans_temp(self):
+        from util import _updater_payload
+
+        release = self.tmp / "temp" / "extracted"
+        (release / "src").mkdir(parents=True)
+        (release / "src" / "main.py").write_text("new")
+        install = self.tmp / "install"
+        (install / "src").mkdir(parents=True)
+        (install / "src" / "stale.py").write_text("old")
+        pyproject = self.tmp / "pyproject.toml"
+        pyproject.write_text('[project]\nversion = "2.0"\n')
+
+        # An already reaped process stands in for the exited CLI
+        parent = subprocess.Popen([sys.executable, "-c", ""])
+        parent.wait()
+        with patch.object(_updater_payload.time, "sleep"):
+            _updater_payload.main([
+                "--log-file", str(self.tmp / "update.log"),
+                "--parent-pid", str(parent.pid),
+                "--src-dir", str(release),
+                "--install-dir", str(install),
+                "--temp-root", str(self.tmp / "temp"),
+                "--pyproject-file", str(pyproject),
+            ])
+
+        self.assertEqual((install / "src" / "main.py").read_text(), "new")
+        self.assertFalse((install / "src" / "stale.py").exists())
+        self.assertEqual((install / "pyproject.toml").read_text(), pyproject.read_text())
+        self.assertFalse((self.tmp / "temp").exists())
+        self.assertIn("Files copied successfully.", (self.tmp / "update.log").read_text())
+
+
+class TestUpdateStatus(unittest.TestCase):
+    def test_buffered_lines_match_printer(self):
+        import io
+        from util.output import Printer
+
+        status = update._UpdateStatus()
+        status.interactive = False
+        expected = io.StringIO()
+        with patch.object(sys, "stdout", expected):
+            Printer.action("CHECK", "checking")
+            Printer.warning("new version")
+
+        out = io.StringIO()
+        with patch.object(sys, "stdout", out):
+            status.action("CHECK", "checking")
+            status.warning("new version")
+            self.assertEqual(out.getvalue(), "")
+            status.flush()
+        self.assertEqual(out.getvalue(), expected.getvalue())
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "POSIX only")
+class TestSpawnDetached(unittest.TestCase):
+    def test_grandchild_runs_in_new_session(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            marker = Path(tmp) / "sid"
+            code = f"import os; open({str(marker)!r}, 'w').write(str(os.getsid(0)))"
+            update._spawn_detached([sys.executable, "-c", code])
+            for _ in range(100):
+                if marker.exists() and marker.read_text():
+                    break
+                time.sleep(0.05)
+            self.assertNotEqual(marker.read_text(), str(os.getsid(0)))
@@ -5,7 +5,7 @@ import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
-from src.util.validator import Validator
+from util.validator import Validator
 
 class TestValidator(unittest.TestCase):
     def test_validate_path_safe(self):
@@ -15,3 +15,12 @@ class TestValidator(unittest.TestCase):
     def test_validate_path_unsafe(self):
         self.assertFalse(Validator.validate_path(Path("test;rm -rf /")))
         self.assertFalse(Validator.validate_path(Path("$(echo pwned)")))
+
+    def test_validate_path_unsafe_with_source_extension(self):
+        # The extension alone must not make a name safe
+        self.assertFalse(Validator.validate_path(Path("$(echo pwned).c")))
+        self.assertFalse(Validator.validate_path(Path("a;b.py")))
+
+    def test_validate_path_redirection_and_newline(self):
+        self.assertFalse(Validator.validate_path(Path("out>main.c")))
+        self.assertFalse(Validator.validate_path(Path("main\nrm.c")))
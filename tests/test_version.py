@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import patch
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from util import version as version_module
+from util.version import version
+
+class TestVersion(unittest.TestCase):
+    def setUp(self):
+        fd, name = tempfile.mkstemp(suffix=".toml")
+        os.close(fd)
+        self.path = Path(name)
+        self.path.write_text('[project]\nversion = "1.0.0"\n')
+
+    def tearDown(self):
+        self.path.unlink()
+
+    def test_parsed_once_until_modified(self):
+        with patch.object(version_module, "_parse_version", wraps=version_module._parse_version) as loads:
+            self.assertEqual(version(self.path), "1.0.0")
+            self.assertEqual(version(self.path), "1.0.0")
+            self.assertEqual(loads.call_count, 1)
+
+            self.path.write_text('[project]\nversion = "1.0.1"\n')
+            st = self.path.stat()
+            os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            self.assertEqual(version(self.path), "1.0.1")
+            self.assertEqual(loads.call_count, 2)
+
+    def test_plain_file_skips_tomllib(self):
+        src = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+        script = (f"import sys; sys.path.insert(0, {src!r})\n"
+                  "from pathlib import Path\n"
+                  "from util.version import version\n"
+                  f"assert version() and version(Path({str(self.path)!r})) == '1.0.0'\n"
+                  "print('tomllib' in sys.modules)")
+        res = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        self.assertEqual(res.stdout.strip(), "False")
+
+    def test_other_tables_and_tomllib_fallback(self):
+        self.assertEqual(version_module._parse_version(
+            '[tool.x]\nversion = "9"\n[project]\nname = "run"\nversion = "1.2" # release\n'), "1.2")
+        # Literal strings are left to tomllib
+        self.assertEqual(version_module._parse_version("[project]\nversion = '2.0'\n"), "2.0")
+        self.assertIsNone(version_module._parse_version('[tool.x]\nversion = "9"\n'))
+
+    def test_scan_defers_to_tomllib(self):
+        # [[tool.foo]] ends the project table, a dynamic version has none
+        self.assertIsNone(version_module._parse_version(
+            '[project]\ndynamic = ["version"]\n[[tool.foo]]\nversion = "9.9"\n'))
+        # Lines inside a multi-line string are not keys
+        self.assertEqual(version_module._parse_version(
+            '[project]\ndescription = """\n[project]\nversion = "evil"\n"""\nversion = "1.0"\n'), "1.0")
+        self.assertEqual(version_module._parse_version(
+            "[project]\ndescription = '''\nversion = \"evil\"\n'''\nversion = \"1.0\"\n"), "1.0")
+
+    def test_missing_file(self):
+        self.assertIsNone(version(self.path.with_name("missing.toml")))